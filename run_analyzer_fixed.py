@@ -26,7 +26,8 @@ def main():
     analyzer.load_data(
         video_folder="0222",   
         size_folder="0523",     
-        user_folder="0528"      
+        user_folder="0528",
+        lazy=True
     )
     
     analyzer.run_interactive_mode()
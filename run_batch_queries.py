@@ -0,0 +1,119 @@
+import os
+import sys
+import json
+import argparse
+import contextlib
+
+BATCH_CHUNK_ROWS = 10000
+
+
+def read_queries(query_path):
+    """Yield (line_number, line) for every non-blank, non-comment line of the query file."""
+    with open(query_path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield line_number, line
+
+
+def parse_query(line_number, line):
+    """Return (query_id, name, params) of one query line, raising ValueError when it is not a valid query."""
+    params = json.loads(line)
+    if not isinstance(params, dict):
+        raise ValueError("query line must be a JSON object")
+    if 'query' not in params:
+        raise ValueError("query line has no \"query\" key")
+    
+    name = params.pop('query')
+    query_id = str(params.pop('id', line_number))
+    return query_id, name, params
+
+
+def write_jsonl(out, query_id, result):
+    """Append result to out as one JSON object per row, tagged with the query id."""
+    for start in range(0, len(result), BATCH_CHUNK_ROWS):
+        chunk = result.iloc[start:start + BATCH_CHUNK_ROWS]
+        lines = chunk.assign(query_id=query_id).to_json(orient='records', lines=True)
+        out.write(lines if lines.endswith('\n') else lines + '\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a file of analyzer queries against one loaded dataset.")
+    parser.add_argument('queries', help="query file: one JSON object per line, e.g. "
+                                        "{\"query\": \"get_top_k_rated_videos\", \"k\": 20}")
+    parser.add_argument('--data-directory', default="youtube_data")
+    parser.add_argument('--video-folder', default="0222")
+    parser.add_argument('--size-folder', default="0523")
+    parser.add_argument('--user-folder', default="0528")
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--compact', action='store_true')
+    parser.add_argument('--format', choices=['jsonl', 'csv'], default='jsonl')
+    parser.add_argument('--output', help="JSON lines file (stdout by default), or the directory "
+                                         "that receives one <id>.csv per query with --format csv")
+    parser.add_argument('--profile', help="write per-stage timings to this JSON file "
+                                          "(a Chrome trace when it ends in .trace.json)")
+    args = parser.parse_args()
+    
+    if not os.path.exists(args.data_directory):
+        print(f"Error: Directory '{args.data_directory}' not found", file=sys.stderr)
+        return 1
+    
+    from youtube_analyzer_complete import YouTubeDataAnalyzer
+    
+    analyzer = YouTubeDataAnalyzer(args.data_directory, profile=True if args.profile else None)
+    
+    with contextlib.redirect_stdout(sys.stderr):
+        analyzer.load_data(
+            video_folder=args.video_folder,
+            size_folder=args.size_folder,
+            user_folder=args.user_folder,
+            workers=args.workers,
+            compact=args.compact,
+            lazy=True
+        )
+    
+    if args.format == 'csv':
+        output_directory = args.output or "batch_results"
+        os.makedirs(output_directory, exist_ok=True)
+        out = None
+    else:
+        out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    
+    failures = 0
+    try:
+        for line_number, line in read_queries(args.queries):
+            query_id, name = str(line_number), None
+            try:
+                query_id, name, params = parse_query(line_number, line)
+                with contextlib.redirect_stdout(sys.stderr):
+                    result = analyzer.run_query(name, **params)
+            except Exception as e:
+                failures += 1
+                print(f"Error in query {query_id} ({name or 'unparsed line'}): {e}", file=sys.stderr)
+                if out is not None:
+                    out.write(json.dumps({'query_id': query_id, 'error': str(e)}) + '\n')
+                continue
+            
+            if result is None:
+                continue
+            
+            if out is not None:
+                write_jsonl(out, query_id, result)
+                out.flush()
+            else:
+                result.to_csv(os.path.join(output_directory, f"{query_id}.csv"), index=False)
+            
+            print(f"Query {query_id} ({name}): {len(result)} rows", file=sys.stderr)
+    finally:
+        if out is not None and out is not sys.stdout:
+            out.close()
+    
+    if args.profile:
+        with contextlib.redirect_stdout(sys.stderr):
+            analyzer.profiler.export(args.profile)
+    
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+import io
+import os
+import sys
+import json
+import time
+import platform
+import shutil
+import argparse
+import contextlib
+import subprocess
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from synthetic_crawl import SCALES, generate_crawl, generate_later_snapshot
+from youtube_analyzer_complete import peak_rss_bytes
+
+APPEND_FOLDER = 'append'
+LATER_SNAPSHOT_FOLDER = '0301'
+GRAPH_STORE_FOLDER = 'graph_store'
+
+
+def timed(step, setup=None):
+    """Run step once (after its untimed setup) with output suppressed; return its result and wall-clock seconds."""
+    args = setup() if setup is not None else ()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = step(*args)
+    return result, time.perf_counter() - started
+
+
+def measure(step, trace_memory: bool = True, setup=None):
+    """Time step cold and warm, then repeat it under tracemalloc for its memory peak, and return a dict."""
+    result, cold = timed(step, setup)
+    record = {'seconds': round(cold, 6), 'warm_seconds': round(timed(step, setup)[1], 6)}
+    
+    # tracemalloc slows allocation-heavy steps several times over, so memory gets its own run.
+    if trace_memory:
+        args = setup() if setup is not None else ()
+        tracemalloc.start()
+        with contextlib.redirect_stdout(io.StringIO()):
+            step(*args)
+        record['peak_traced_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    record['peak_rss_bytes'] = peak_rss_bytes()
+    
+    if isinstance(result, tuple):
+        result = result[1]
+    if isinstance(result, pd.DataFrame):
+        record['rows'] = len(result)
+    elif isinstance(result, (int, np.integer)):
+        record['value'] = int(result)
+    
+    return record
+
+
+def append_setup(data_directory: str, workers: int):
+    """Return a setup that loads all but the last depth file into a fresh analyzer and then adds that file."""
+    from youtube_analyzer_complete import YouTubeDataAnalyzer
+    
+    source = os.path.join(data_directory, '0222')
+    target = os.path.join(data_directory, APPEND_FOLDER)
+    depth_files = sorted(name for name in os.listdir(source) if name[0].isdigit() and name.endswith('.txt'))
+    
+    def setup():
+        os.makedirs(target, exist_ok=True)
+        for name in depth_files[:-1]:
+            if not os.path.exists(os.path.join(target, name)):
+                shutil.copyfile(os.path.join(source, name), os.path.join(target, name))
+        last = os.path.join(target, depth_files[-1])
+        if os.path.exists(last):
+            os.remove(last)
+        
+        fresh = YouTubeDataAnalyzer(data_directory, query_cache_entries=0)
+        with contextlib.redirect_stdout(io.StringIO()):
+            fresh.load_data(APPEND_FOLDER, workers=workers)
+        shutil.copyfile(os.path.join(source, depth_files[-1]), last)
+        return (fresh,)
+    
+    return setup
+
+
+def benchmark_steps(analyzer, data_directory: str, workers: int):
+    """(name, callable[, setup]) tuples covering loading, appending, every query type, the patterns and snapshots."""
+    from youtube_analyzer_complete import YouTubeDataAnalyzer
+    
+    def load(use_cache):
+        def run():
+            fresh = YouTubeDataAnalyzer(data_directory, query_cache_entries=0)
+            fresh.load_data('0222', '0523', '0528', workers=workers, use_cache=use_cache)
+            return len(fresh.video_df)
+        return run
+    
+    store_path = os.path.join(data_directory, GRAPH_STORE_FOLDER)
+    
+    def open_store():
+        fresh = YouTubeDataAnalyzer(data_directory, query_cache_entries=0)
+        return fresh.open_graph_store(store_path)
+    
+    def pattern_graph():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return (analyzer.find_recommendation_patterns('triangle', limit=50, seed=0)[0],)
+    
+    image_path = os.path.join(data_directory, 'benchmark_graph.png')
+    
+    return [
+        ('load_data', load(False)),
+        ('load_data_snapshot', load(True)),
+        ('append_data', lambda fresh: fresh.append_data(APPEND_FOLDER, workers), append_setup(data_directory, workers)),
+        ('_extract_related_videos', analyzer._extract_related_videos),
+        ('get_top_k_categories', lambda: analyzer.get_top_k_categories(10)),
+        ('get_top_k_rated_videos', lambda: analyzer.get_top_k_rated_videos(10, 10)),
+        ('get_top_k_popular_videos', lambda: analyzer.get_top_k_popular_videos(10)),
+        ('get_top_k_per_category', lambda: analyzer.get_top_k_per_category(10, 'views')),
+        ('find_videos_by_category_and_duration',
+         lambda: analyzer.find_videos_by_category_and_duration('Music', 60, 300)),
+        ('find_videos_by_size_range', lambda: analyzer.find_videos_by_size_range(5000, 20000)),
+        ('query_range_views', lambda: analyzer.query_range('views', 1000, 100000)),
+        ('pattern_user_video_user', lambda: analyzer.find_recommendation_patterns('user_video_user', 3)),
+        ('pattern_video_user_video', lambda: analyzer.find_recommendation_patterns('video_user_video')),
+        ('pattern_triangle', lambda: analyzer.find_recommendation_patterns('triangle', limit=50, seed=0)),
+        ('count_triangles', analyzer.count_triangles),
+        ('find_triangles', lambda: analyzer.find_triangles(1000, seed=0)),
+        ('visualize_graph_headless',
+         lambda G: analyzer.visualize_graph(G, 'benchmark', filename=image_path, headless=True), pattern_graph),
+        ('build_graph_store', lambda: analyzer.build_graph_store(store_path)),
+        ('open_graph_store', open_store),
+        ('get_uploader_clusters', analyzer.get_uploader_clusters),
+        ('get_same_uploader_pairs', lambda: analyzer.get_same_uploader_pairs(page=1, page_size=100)),
+        ('compute_centrality', analyzer.compute_centrality),
+        ('get_top_k_uploaders', lambda: analyzer.get_top_k_uploaders(10, 'rate', 'mean', min_videos=5)),
+        ('get_uploader_categories', lambda: analyzer.get_uploader_categories('user0')),
+        ('get_friend_components', analyzer.get_friend_components),
+        ('get_top_k_connected_users', lambda: analyzer.get_top_k_connected_users(10)),
+        ('get_friend_degree_distribution', analyzer.get_friend_degree_distribution),
+        ('count_mutual_friends', lambda: analyzer.count_mutual_friends('user0', 'user1')),
+        ('load_snapshots', lambda: analyzer.load_snapshots(['0222', LATER_SNAPSHOT_FOLDER], workers)),
+        ('get_snapshot_deltas', lambda: analyzer.get_snapshot_deltas('views')),
+        ('get_top_k_growth', lambda: analyzer.get_top_k_growth(10, 'views', 'growth')),
+    ]
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time and memory-profile the analyzer on synthetic crawls.")
+    parser.add_argument('--scales', default='10k,100k', help=f"comma-separated video counts or {', '.join(SCALES)}")
+    parser.add_argument('--data-root', default="benchmark_data", help="where the synthetic crawls are generated")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--no-memory', action='store_true', help="skip tracemalloc (faster, timings only)")
+    parser.add_argument('--output', default="benchmark_results.json")
+    args = parser.parse_args()
+    
+    from youtube_analyzer_complete import YouTubeDataAnalyzer
+    
+    report = {
+        'revision': git_revision(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'seed': args.seed,
+        'scales': {}
+    }
+    
+    for scale in args.scales.split(','):
+        videos = SCALES.get(scale) or int(scale)
+        data_directory = os.path.join(args.data_root, f"{scale}_seed{args.seed}")
+        if not os.path.exists(os.path.join(data_directory, '0222')):
+            generate_crawl(data_directory, videos, args.seed)
+        if not os.path.exists(os.path.join(data_directory, LATER_SNAPSHOT_FOLDER)):
+            generate_later_snapshot(data_directory, args.seed, target=LATER_SNAPSHOT_FOLDER)
+        
+        analyzer = YouTubeDataAnalyzer(data_directory, query_cache_entries=0)
+        with contextlib.redirect_stdout(io.StringIO()):
+            analyzer.load_data('0222', '0523', '0528', workers=args.workers)
+        
+        steps = {}
+        for name, step, *setup in benchmark_steps(analyzer, data_directory, args.workers):
+            steps[name] = measure(step, not args.no_memory, *setup)
+            print(f"{scale:>6} {name:<40} {steps[name]['seconds']:>9.3f}s "
+                  f"{steps[name].get('peak_traced_bytes', 0) / 1024 ** 2:>9.1f} MB")
+        
+        report['scales'][scale] = {'videos': videos, 'rows': len(analyzer.video_df),
+                                   'edges': len(analyzer.related_targets), 'steps': steps}
+    
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qsl
+
+import numpy as np
+
+PATTERN_QUERIES = {'find_recommendation_patterns', 'count_triangles', 'find_triangles', 'get_uploader_clusters',
+                   'get_same_uploader_pairs', 'get_friend_components'}
+LATENCY_WINDOW = 10000
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+               500: 'Internal Server Error'}
+
+
+def parse_value(value):
+    """Query-string values are JSON when they parse as JSON (numbers, lists, null) and strings otherwise."""
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+class QueryServer:
+    """Serves analyzer queries over HTTP from one loaded dataset, with pattern jobs on their own executor."""
+    
+    def __init__(self, analyzer, query_names, fast_workers: int = 4, pattern_workers: int = 1):
+        self.analyzer = analyzer
+        self.query_names = set(query_names)
+        self.fast_executor = ThreadPoolExecutor(max_workers=fast_workers, thread_name_prefix='query')
+        self.pattern_executor = ThreadPoolExecutor(max_workers=pattern_workers, thread_name_prefix='pattern')
+        self.latencies = defaultdict(lambda: deque(maxlen=LATENCY_WINDOW))
+    
+    def stats(self):
+        """Request count and latency percentiles (milliseconds) over the recent window of every endpoint."""
+        report = {}
+        for endpoint, samples in sorted(self.latencies.items()):
+            p50, p95, p99 = np.percentile(np.fromiter(samples, dtype=np.float64), [50, 95, 99])
+            report[endpoint] = {'count': len(samples), 'p50_ms': round(p50, 3),
+                                'p95_ms': round(p95, 3), 'p99_ms': round(p99, 3)}
+        return report
+    
+    async def dispatch(self, method: str, target: str, body: bytes):
+        url = urlsplit(target)
+        endpoint = url.path.strip('/')
+        
+        if endpoint == 'stats':
+            return 200, json.dumps(self.stats())
+        if endpoint == 'queries':
+            return 200, json.dumps(sorted(self.query_names))
+        if endpoint == 'profile':
+            return 200, self.analyzer.profiler.report().to_json(orient='records')
+        if endpoint not in self.query_names:
+            return 404, json.dumps({'error': f"Unknown endpoint '/{endpoint}'"})
+        if method not in ('GET', 'POST'):
+            return 405, json.dumps({'error': f"Method {method} not allowed"})
+        
+        try:
+            params = {key: parse_value(value) for key, value in parse_qsl(url.query)}
+            if body:
+                payload = json.loads(body)
+                if not isinstance(payload, dict):
+                    raise ValueError("request body must be a JSON object")
+                params.update(payload)
+        except ValueError as e:
+            return 400, json.dumps({'error': f"Invalid parameters: {e}"})
+        
+        executor = self.pattern_executor if endpoint in PATTERN_QUERIES else self.fast_executor
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(executor, lambda: self.analyzer.run_query(endpoint, **params))
+        except (TypeError, ValueError, KeyError) as e:
+            return 400, json.dumps({'error': str(e)})
+        except Exception as e:
+            return 500, json.dumps({'error': str(e)})
+        
+        if result is None:
+            return 200, '{"count": 0, "rows": []}'
+        return 200, f'{{"count": {len(result)}, "rows": {result.to_json(orient="records")}}}'
+    
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                
+                method, target, version = request_line.decode('latin-1').split(None, 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                
+                length = int(headers.get('content-length', 0))
+                body = await reader.readexactly(length) if length else b''
+                
+                started = time.perf_counter()
+                status, payload = await self.dispatch(method, target, body)
+                if status != 404:
+                    self.latencies[urlsplit(target).path].append((time.perf_counter() - started) * 1000)
+                
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and version.strip() == 'HTTP/1.1')
+                data = payload.encode('utf-8')
+                writer.write((f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+                              f"Content-Type: application/json\r\n"
+                              f"Content-Length: {len(data)}\r\n"
+                              f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode('latin-1') + data)
+                await writer.drain()
+                
+                if not keep_alive:
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+    
+    async def serve(self, host: str, port: int):
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"Serving {len(self.query_names)} queries on http://{host}:{port}/ "
+              f"(latency report at /stats, stage profile at /profile)")
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve analyzer queries over HTTP from one loaded dataset.")
+    parser.add_argument('--data-directory', default="youtube_data")
+    parser.add_argument('--video-folder', default="0222")
+    parser.add_argument('--size-folder', default="0523")
+    parser.add_argument('--user-folder', default="0528")
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--compact', action='store_true')
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--query-threads', type=int, default=4)
+    parser.add_argument('--pattern-threads', type=int, default=1)
+    parser.add_argument('--profile', action='store_true', help="record per-stage timings, served at /profile")
+    args = parser.parse_args()
+    
+    if not os.path.exists(args.data_directory):
+        print(f"Error: Directory '{args.data_directory}' not found")
+        return 1
+    
+    from youtube_analyzer_complete import YouTubeDataAnalyzer, BATCH_QUERIES
+    
+    analyzer = YouTubeDataAnalyzer(args.data_directory, profile=True if args.profile else None)
+    analyzer.load_data(
+        video_folder=args.video_folder,
+        size_folder=args.size_folder,
+        user_folder=args.user_folder,
+        workers=args.workers,
+        compact=args.compact
+    )
+    
+    # Build the shared query indexes up front so concurrent first requests do not race to create them.
+    # Centrality adds columns to video_df, so it must also run before any request thread reads the frame.
+    analyzer.top_k
+    analyzer.range_index
+    analyzer.compute_centrality()
+    
+    server = QueryServer(analyzer, BATCH_QUERIES, args.query_threads, args.pattern_threads)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("Shutting down...")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
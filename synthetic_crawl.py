@@ -0,0 +1,161 @@
+import os
+import sys
+import argparse
+
+import numpy as np
+
+SCALES = {'10k': 10000, '100k': 100000, '1M': 1000000}
+ID_ALPHABET = np.array(list("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"))
+CATEGORIES = ['Music', 'Entertainment', 'Comedy', 'People & Blogs', 'Film & Animation', 'Sports',
+              'Gadgets & Games', 'News & Politics', 'Autos & Vehicles', 'Howto & DIY', 'Pets & Animals',
+              'Travel & Places', 'UNA']
+CATEGORY_WEIGHTS = np.array([22, 18, 14, 12, 9, 6, 5, 5, 3, 2, 2, 1, 1], dtype=np.float64)
+DEPTH_FRACTIONS = [0.002, 0.03, 0.12, 0.3, 0.548]
+RELATED_PER_VIDEO = 20
+WRITE_BATCH_ROWS = 50000
+
+
+def random_ids(rng, count: int):
+    """Random 11-character YouTube-style IDs."""
+    letters = ID_ALPHABET[rng.integers(0, len(ID_ALPHABET), size=(count, 11))]
+    return letters.view('<U11').ravel().astype(object)
+
+
+def zipf_choice(rng, size: int, count: int, exponent: float):
+    """Draw count indexes in [0, size) whose frequency falls off as a power law of the index."""
+    weights = 1.0 / np.arange(1, size + 1) ** exponent
+    return np.searchsorted(np.cumsum(weights) / weights.sum(), rng.random(count))
+
+
+def related_targets(rng, uploaders, views):
+    """Pick RELATED_PER_VIDEO-or-fewer related videos per video: mostly popular, nearby or same-uploader videos."""
+    count = len(uploaders)
+    degrees = np.where(rng.random(count) < 0.8, RELATED_PER_VIDEO, rng.integers(1, RELATED_PER_VIDEO, count))
+    sources = np.repeat(np.arange(count), degrees)
+    kind = rng.random(len(sources))
+    
+    targets = np.clip(sources + rng.normal(0, 40, len(sources)).astype(np.int64), 0, count - 1)
+    
+    popular = kind < 0.3
+    cumulative = np.cumsum(np.sqrt(views.astype(np.float64)))
+    targets[popular] = np.minimum(np.searchsorted(cumulative, rng.random(int(popular.sum())) * cumulative[-1]), count - 1)
+    
+    same_uploader = (kind >= 0.3) & (kind < 0.4)
+    by_uploader = np.argsort(uploaders, kind='stable')
+    first = np.searchsorted(uploaders[by_uploader], uploaders, side='left')
+    last = np.searchsorted(uploaders[by_uploader], uploaders, side='right')
+    source_rows = sources[same_uploader]
+    offset = (rng.random(len(source_rows)) * (last - first)[source_rows]).astype(np.int64)
+    targets[same_uploader] = by_uploader[first[source_rows] + offset]
+    
+    outside = kind >= 0.85
+    return degrees, targets, outside
+
+
+def generate_crawl(root: str, videos: int, seed: int = 0):
+    """Write a deterministic crawl with depth files (0222), a size file (0523) and a user file (0528) under root."""
+    rng = np.random.default_rng(seed)
+    
+    video_ids = random_ids(rng, videos)
+    uploader_count = max(videos // 4, 1)
+    uploader_names = np.array([f"user{i}" for i in range(uploader_count)], dtype=object)
+    uploaders = zipf_choice(rng, uploader_count, videos, 0.9)
+    category_codes = rng.choice(len(CATEGORIES), videos, p=CATEGORY_WEIGHTS / CATEGORY_WEIGHTS.sum())
+    categories = np.array(CATEGORIES, dtype=object)[category_codes]
+    
+    ages = rng.integers(0, 1200, videos)
+    lengths = np.clip(rng.lognormal(5.0, 0.9, videos), 1, 6000).astype(np.int64)
+    views = np.clip(rng.lognormal(8.0, 2.2, videos), 0, 2e8).astype(np.int64)
+    ratings = (views * rng.uniform(0.001, 0.02, videos)).astype(np.int64)
+    comments = (ratings * rng.uniform(0.05, 0.6, videos)).astype(np.int64)
+    rates = np.where(ratings > 0, np.round(rng.beta(5, 1.5, videos) * 5, 2), 0.0)
+    
+    degrees, targets, outside = related_targets(rng, uploaders, views)
+    related = video_ids[targets]
+    related[outside] = random_ids(rng, int(outside.sum()))
+    offsets = np.concatenate([[0], np.cumsum(degrees)])
+    
+    video_folder = os.path.join(root, '0222')
+    os.makedirs(video_folder, exist_ok=True)
+    boundaries = np.round(np.cumsum([0] + DEPTH_FRACTIONS) * videos).astype(np.int64)
+    boundaries[-1] = videos
+    for depth in range(len(DEPTH_FRACTIONS)):
+        with open(os.path.join(video_folder, f"{depth}.txt"), 'w', encoding='utf-8') as f:
+            for start in range(boundaries[depth], boundaries[depth + 1], WRITE_BATCH_ROWS):
+                end = min(start + WRITE_BATCH_ROWS, boundaries[depth + 1])
+                lines = []
+                for row in range(start, end):
+                    fields = [video_ids[row], uploader_names[uploaders[row]], str(ages[row]), categories[row],
+                              str(lengths[row]), str(views[row]), f"{rates[row]:.2f}", str(ratings[row]),
+                              str(comments[row])]
+                    lines.append('\t'.join(fields + list(related[offsets[row]:offsets[row + 1]])))
+                f.write('\n'.join(lines) + '\n')
+    with open(os.path.join(video_folder, 'log.txt'), 'w', encoding='utf-8') as f:
+        f.write(f"synthetic crawl\n\nvideos: {videos}\nseed: {seed}\n")
+    
+    size_folder = os.path.join(root, '0523')
+    os.makedirs(size_folder, exist_ok=True)
+    sized = np.flatnonzero(rng.random(videos) < 0.9)
+    sizes = (lengths[sized] * rng.uniform(20, 60, len(sized))).astype(np.int64)
+    with open(os.path.join(size_folder, 'size.txt'), 'w', encoding='utf-8') as f:
+        for start in range(0, len(sized), WRITE_BATCH_ROWS):
+            rows = sized[start:start + WRITE_BATCH_ROWS]
+            f.write('\n'.join(f"{video_id}\t{size}" for video_id, size in
+                              zip(video_ids[rows], sizes[start:start + WRITE_BATCH_ROWS])) + '\n')
+    
+    user_folder = os.path.join(root, '0528')
+    os.makedirs(user_folder, exist_ok=True)
+    uploads = np.bincount(uploaders, minlength=uploader_count)
+    friend_counts = np.minimum(rng.zipf(2.0, uploader_count) - 1, 500)
+    friends = zipf_choice(rng, uploader_count, int(friend_counts.sum()), 0.6)
+    friend_offsets = np.concatenate([[0], np.cumsum(friend_counts)])
+    with open(os.path.join(user_folder, 'user.txt'), 'w', encoding='utf-8') as f:
+        for start in range(0, uploader_count, WRITE_BATCH_ROWS):
+            lines = []
+            for user in range(start, min(start + WRITE_BATCH_ROWS, uploader_count)):
+                friend_names = uploader_names[friends[friend_offsets[user]:friend_offsets[user + 1]]]
+                lines.append(f"{uploader_names[user]}\t{uploads[user]}\t{','.join(friend_names)}")
+            f.write('\n'.join(lines) + '\n')
+    
+    print(f"Wrote {videos} videos, {len(sized)} sizes and {uploader_count} users to {root}")
+    return root
+
+
+def generate_later_snapshot(root: str, seed: int = 0, source: str = '0222', target: str = '0301'):
+    """Copy the source depth files to a later snapshot folder with views, ratings and comments grown per video."""
+    rng = np.random.default_rng(seed + 1)
+    
+    source_folder = os.path.join(root, source)
+    target_folder = os.path.join(root, target)
+    os.makedirs(target_folder, exist_ok=True)
+    for depth in range(len(DEPTH_FRACTIONS)):
+        with open(os.path.join(source_folder, f"{depth}.txt"), 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        growth = rng.lognormal(0.1, 0.3, len(lines))
+        with open(os.path.join(target_folder, f"{depth}.txt"), 'w', encoding='utf-8') as f:
+            for start in range(0, len(lines), WRITE_BATCH_ROWS):
+                rows = []
+                for line, factor in zip(lines[start:start + WRITE_BATCH_ROWS], growth[start:start + WRITE_BATCH_ROWS]):
+                    fields = line.split('\t')
+                    for column in (5, 7, 8):
+                        fields[column] = str(int(int(fields[column]) * max(factor, 1.0)))
+                    rows.append('\t'.join(fields))
+                f.write('\n'.join(rows) + '\n')
+    
+    print(f"Wrote a later snapshot of {source} to {target_folder}")
+    return target_folder
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a deterministic synthetic crawl in the analyzer's data format.")
+    parser.add_argument('root', help="output directory; receives 0222/, 0523/ and 0528/")
+    parser.add_argument('--videos', default='10k', help=f"video count or one of {', '.join(SCALES)}")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    
+    generate_crawl(args.root, SCALES.get(args.videos) or int(args.videos), args.seed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,20 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def build_video_line(video_id: str, related=20, uploader: str = 'uploader1', category: str = 'Music',
+                     length: int = 200, views: int = 5000, rate: float = 4.5):
+    """One tab-separated depth file line; related is a list of IDs or a count of generated '<id>r<i>' IDs."""
+    if isinstance(related, int):
+        related = [f"{video_id}r{i}" for i in range(related)]
+    fields = [video_id, uploader, '100', category, str(length), str(views), str(rate), '30', '10']
+    return '\t'.join(fields + list(related))
+
+
+@pytest.fixture
+def video_line():
+    return build_video_line
@@ -0,0 +1,57 @@
+import numpy as np
+
+from youtube_analyzer_complete import YouTubeDataAnalyzer, _hits, _pagerank
+
+# Node 4 has no out-edges (dangling) and node 5 is never linked to.
+EDGES = [(0, 1), (0, 2), (1, 2), (2, 0), (3, 2), (3, 4), (5, 0), (5, 3)]
+NODE_COUNT = 6
+
+
+def csr(edges, node_count):
+    sources, targets = np.array(edges).T
+    order = np.argsort(sources, kind='stable')
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(sources, minlength=node_count))])
+    return offsets, targets[order].astype(np.int32)
+
+
+def dominant(matrix):
+    values, vectors = np.linalg.eig(matrix)
+    vector = np.abs(np.real(vectors[:, np.argmax(np.real(values))]))
+    return vector / vector.sum()
+
+
+def test_pagerank_matches_dense_google_matrix():
+    adjacency = np.zeros((NODE_COUNT, NODE_COUNT))
+    for source, target in EDGES:
+        adjacency[source, target] = 1
+    out_degree = adjacency.sum(axis=1, keepdims=True)
+    transition = np.where(out_degree > 0, adjacency / np.maximum(out_degree, 1), 1.0 / NODE_COUNT)
+    google = 0.85 * transition + 0.15 / NODE_COUNT
+    
+    rank, _ = _pagerank(*csr(EDGES, NODE_COUNT), damping=0.85, tolerance=1e-12)
+    assert np.allclose(rank, dominant(google.T), atol=1e-9)
+    assert np.isclose(rank.sum(), 1.0)
+
+
+def test_hits_matches_dense_eigenvectors():
+    adjacency = np.zeros((NODE_COUNT, NODE_COUNT))
+    for source, target in EDGES:
+        adjacency[source, target] = 1
+    
+    hub, authority, _ = _hits(*csr(EDGES, NODE_COUNT), tolerance=1e-12)
+    assert np.allclose(hub, dominant(adjacency @ adjacency.T), atol=1e-8)
+    assert np.allclose(authority, dominant(adjacency.T @ adjacency), atol=1e-8)
+
+
+def test_compute_centrality_adds_columns(tmp_path, video_line):
+    (tmp_path / '0222').mkdir()
+    lines = [video_line('aaaaaaaaaaa', ['bbbbbbbbbbb', 'ccccccccccc']), video_line('bbbbbbbbbbb', ['ccccccccccc']),
+             video_line('ccccccccccc', ['aaaaaaaaaaa', 'ddddddddddd'])]
+    (tmp_path / '0222' / '0.txt').write_text('\n'.join(lines) + '\n')
+    
+    analyzer = YouTubeDataAnalyzer(str(tmp_path), query_cache_entries=0)
+    analyzer.load_data('0222', use_cache=False)
+    top = analyzer.get_top_k_central_videos(1, 'pagerank')
+    
+    assert list(top['video_id']) == ['ccccccccccc']
+    assert list(analyzer.video_df['reach']) == [1, 1, 2]
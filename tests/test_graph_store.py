@@ -0,0 +1,29 @@
+from youtube_analyzer_complete import EncodedVideoIds, YouTubeDataAnalyzer
+
+
+def test_open_graph_store_replaces_loaded_data(tmp_path, video_line):
+    (tmp_path / '0222').mkdir()
+    (tmp_path / '0222' / '0.txt').write_text('\n'.join([
+        video_line('aaaaaaaaaaa', ['bbbbbbbbbbb', 'ccccccccccc'], uploader='u1'),
+        video_line('bbbbbbbbbbb', ['ccccccccccc', 'aaaaaaaaaaa'], uploader='u2'),
+        video_line('ccccccccccc', ['aaaaaaaaaaa', 'bbbbbbbbbbb'], uploader='u1'),
+    ]) + '\n')
+    (tmp_path / 'other').mkdir()
+    (tmp_path / 'other' / '0.txt').write_text(video_line('ddddddddddd', ['eeeeeeeeeee'], uploader='u3') + '\n')
+    
+    source = YouTubeDataAnalyzer(str(tmp_path), query_cache_entries=0)
+    source.load_data('0222', use_cache=False)
+    expected = source.find_recommendation_patterns('triangle')[1]
+    assert source.build_graph_store(str(tmp_path / 'store'))
+    
+    analyzer = YouTubeDataAnalyzer(str(tmp_path), query_cache_entries=0)
+    analyzer.load_data('other', use_cache=False)
+    assert analyzer.open_graph_store(str(tmp_path / 'store'))
+    
+    assert analyzer.video_df is None
+    assert analyzer.uploader_cube is None
+    assert isinstance(analyzer.node_ids, EncodedVideoIds)
+    assert analyzer.node_ids[0] == 'aaaaaaaaaaa'
+    result = analyzer.find_recommendation_patterns('triangle')[1]
+    assert sorted(map(sorted, result[['video1', 'video2', 'video3']].to_numpy().tolist())) == \
+        sorted(map(sorted, expected[['video1', 'video2', 'video3']].to_numpy().tolist()))
@@ -0,0 +1,52 @@
+from youtube_analyzer_complete import YouTubeDataAnalyzer
+
+
+def load(root, **options):
+    analyzer = YouTubeDataAnalyzer(str(root), query_cache_entries=0)
+    analyzer.load_data('0222', **options)
+    return analyzer
+
+
+def test_partial_last_line_is_left_for_append(tmp_path, video_line, capsys):
+    depth_file = tmp_path / '0222' / '0.txt'
+    depth_file.parent.mkdir()
+    partial = video_line('ccccccccccc')
+    depth_file.write_text(video_line('aaaaaaaaaaa') + '\n' + video_line('bbbbbbbbbbb') + '\n' + partial[:150])
+    
+    analyzer = load(tmp_path, use_cache=False)
+    assert list(analyzer.video_df['video_id']) == ['aaaaaaaaaaa', 'bbbbbbbbbbb']
+    assert "Held back an unterminated last line (150 bytes)" in capsys.readouterr().out
+    
+    with open(depth_file, 'a') as f:
+        f.write(partial[150:] + '\n' + video_line('ddddddddddd') + '\n')
+    
+    assert analyzer.append_data('0222') == 2
+    row = analyzer.video_df.set_index('video_id').loc['ccccccccccc']
+    assert len(row['related_ids'].split(',')) == 20
+    assert len(analyzer.related_targets) == 80
+
+
+def test_partial_last_line_with_snapshot_cache(tmp_path, video_line):
+    depth_file = tmp_path / '0222' / '0.txt'
+    depth_file.parent.mkdir()
+    depth_file.write_text(video_line('aaaaaaaaaaa') + '\n' + video_line('bbbbbbbbbbb')[:40])
+    
+    load(tmp_path)
+    analyzer = load(tmp_path)
+    assert list(analyzer.video_df['video_id']) == ['aaaaaaaaaaa']
+    assert analyzer.ingested_files[str(depth_file)] == len(video_line('aaaaaaaaaaa')) + 1
+
+
+def test_repeated_video_ids_keep_first_row_on_load_and_append(tmp_path, video_line):
+    folder = tmp_path / '0222'
+    folder.mkdir()
+    (folder / '0.txt').write_text(video_line('aaaaaaaaaaa', 5) + '\n' + video_line('aaaaaaaaaaa', 3) + '\n')
+    
+    analyzer = load(tmp_path, use_cache=False)
+    assert len(analyzer.video_df) == 1
+    assert len(analyzer.related_targets) == 5
+    
+    (folder / '1.txt').write_text(video_line('aaaaaaaaaaa', 2) + '\n' + video_line('bbbbbbbbbbb', 4) + '\n')
+    assert analyzer.append_data('0222') == 1
+    assert list(analyzer.video_df['video_id']) == ['aaaaaaaaaaa', 'bbbbbbbbbbb']
+    assert len(analyzer.related_targets) == 9
@@ -0,0 +1,18 @@
+from youtube_analyzer_complete import YouTubeDataAnalyzer
+
+
+def test_user_load_keeps_size_column_and_range_index(tmp_path, video_line, capsys):
+    for folder in ('0222', '0523', '0528'):
+        (tmp_path / folder).mkdir()
+    (tmp_path / '0222' / '0.txt').write_text(video_line('aaaaaaaaaaa', 2) + '\n' + video_line('bbbbbbbbbbb', 2) + '\n')
+    (tmp_path / '0523' / 'size.txt').write_text('aaaaaaaaaaa\t300\n')
+    (tmp_path / '0528' / 'user.txt').write_text('uploader1\t2\tuploader2\nuploader2\t0\tuploader1\n')
+    
+    analyzer = YouTubeDataAnalyzer(str(tmp_path))
+    analyzer.load_data('0222', '0523', '0528', use_cache=False, lazy=True)
+    assert len(analyzer.find_videos_by_size_range(0, 1000)) == 1
+    range_index = analyzer.range_index
+    
+    analyzer.get_top_k_connected_users(1)
+    assert analyzer.range_index is range_index
+    assert capsys.readouterr().out.count("Attached sizes") == 1
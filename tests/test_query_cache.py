@@ -0,0 +1,16 @@
+from youtube_analyzer_complete import YouTubeDataAnalyzer
+
+
+def test_cached_results_are_independent_copies(tmp_path, video_line):
+    (tmp_path / '0222').mkdir()
+    lines = [video_line('aaaaaaaaaaa', 2, views=300), video_line('bbbbbbbbbbb', 2, views=100)]
+    (tmp_path / '0222' / '0.txt').write_text('\n'.join(lines) + '\n')
+    
+    analyzer = YouTubeDataAnalyzer(str(tmp_path))
+    analyzer.load_data('0222', use_cache=False)
+    first = analyzer.get_top_k_popular_videos(2)
+    first.iloc[0, first.columns.get_loc('views')] = 0
+    
+    second = analyzer.get_top_k_popular_videos(2)
+    assert analyzer.query_cache.stats()['hits'] == 1
+    assert list(second['views']) == [300, 100]
@@ -0,0 +1,41 @@
+from youtube_analyzer_complete import YouTubeDataAnalyzer
+
+
+def write_crawl(root, video_line):
+    video_folder = root / '0222'
+    size_folder = root / '0523'
+    video_folder.mkdir()
+    size_folder.mkdir()
+    videos = [('aaaaaaaaaaa', 'Music'), ('bbbbbbbbbbb', 'Music'), ('ccccccccccc', 'Comedy'), ('ddddddddddd', 'Comedy')]
+    lines = [video_line(video_id, 3, category=category) for video_id, category in videos]
+    (video_folder / '0.txt').write_text('\n'.join(lines) + '\n')
+    (size_folder / 'size.txt').write_text('aaaaaaaaaaa\t300\nccccccccccc\t700\n')
+
+
+def test_open_upper_bound_skips_missing_values(tmp_path, video_line):
+    write_crawl(tmp_path, video_line)
+    results = {}
+    for streaming in (False, True):
+        analyzer = YouTubeDataAnalyzer(str(tmp_path), query_cache_entries=0)
+        analyzer.load_data('0222', size_folder='0523', use_cache=False, streaming=streaming)
+        results[streaming] = (
+            sorted(analyzer.query_range('size', min_value=0)['video_id']),
+            sorted(analyzer.query_range('size', min_value=0, category='Comedy')['video_id']),
+        )
+    
+    assert results[False] == (['aaaaaaaaaaa', 'ccccccccccc'], ['ccccccccccc'])
+    assert results[True] == results[False]
+
+
+def test_compact_float_columns_match_exact_bounds(tmp_path, video_line):
+    (tmp_path / '0222').mkdir()
+    rates = [('aaaaaaaaaaa', 4.34, 'Music'), ('bbbbbbbbbbb', 4.34, 'Comedy'), ('ccccccccccc', 4.35, 'Music')]
+    lines = [video_line(video_id, 3, category=category, rate=rate) for video_id, rate, category in rates]
+    (tmp_path / '0222' / '0.txt').write_text('\n'.join(lines) + '\n')
+    
+    for compact in (False, True):
+        analyzer = YouTubeDataAnalyzer(str(tmp_path), query_cache_entries=0)
+        analyzer.load_data('0222', use_cache=False, compact=compact)
+        assert len(analyzer.query_range('rate', 4.34, 4.34)) == 2
+        assert len(analyzer.query_range('rate', 4.34, 4.34, category='Music')) == 1
+        assert len(analyzer.query_range('rate', None, 4.34)) == 2
@@ -0,0 +1,52 @@
+import os
+import gc
+
+from youtube_analyzer_complete import YouTubeDataAnalyzer
+
+
+def test_empty_crawl_streams_without_edges(tmp_path):
+    (tmp_path / '0222').mkdir()
+    (tmp_path / '0222' / '0.txt').write_text('')
+    
+    analyzer = YouTubeDataAnalyzer(str(tmp_path), query_cache_entries=0)
+    analyzer.load_data('0222', streaming=True)
+    assert len(analyzer.video_nodes) == 0
+    assert len(analyzer.related_targets) == 0
+
+
+def test_temporary_spill_directory_is_removed(tmp_path, video_line):
+    (tmp_path / '0222').mkdir()
+    (tmp_path / '0222' / '0.txt').write_text(video_line('aaaaaaaaaaa', ['bbbbbbbbbbb']) + '\n')
+    
+    analyzer = YouTubeDataAnalyzer(str(tmp_path), query_cache_entries=0)
+    analyzer.load_data('0222', streaming=True)
+    first = os.path.dirname(analyzer.related_offsets.filename)
+    analyzer.load_data('0222', streaming=True)
+    second = os.path.dirname(analyzer.related_offsets.filename)
+    assert not os.path.exists(first)
+    
+    del analyzer
+    gc.collect()
+    assert not os.path.exists(second)
+
+
+def test_streaming_matches_in_memory_rows(tmp_path, video_line):
+    folder = tmp_path / '0222'
+    folder.mkdir()
+    (folder / '0.txt').write_text(video_line('aaaaaaaaaaa', 2) + '\n' + video_line('bbbbbbbbbbb', 2) + '\n')
+    (folder / '1.txt').write_text(video_line('bbbbbbbbbbb', 5, category='Comedy') + '\n' +
+                                  video_line('ccccccccccc', 3, category='Comedy') + '\n' +
+                                  video_line('ccccccccccc', 4) + '\n' + video_line('ddddddddddd', 2))
+    
+    results = {}
+    for streaming in (False, True):
+        analyzer = YouTubeDataAnalyzer(str(tmp_path), query_cache_entries=0)
+        analyzer.load_data('0222', use_cache=False, streaming=streaming, chunk_size=1)
+        results[streaming] = (
+            sorted(analyzer.query_range('length', min_value=0)['video_id']),
+            analyzer.get_top_k_categories(5).to_dict('records'),
+            len(analyzer.related_targets),
+        )
+    
+    assert results[False][0] == ['aaaaaaaaaaa', 'bbbbbbbbbbb', 'ccccccccccc']
+    assert results[True] == results[False]
@@ -0,0 +1,41 @@
+import numpy as np
+
+from youtube_analyzer_complete import YouTubeDataAnalyzer
+
+CATEGORIES = ['Music', 'Comedy', 'Sports']
+
+
+def crawl_lines(video_line, count: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return [video_line(f"v{row:010d}", 2, category=CATEGORIES[row % 3], views=int(rng.integers(0, 50)) * 100,
+                       rate=round(float(rng.integers(0, 6)) * 0.75, 2))
+            for row in range(count)]
+
+
+def top_k_results(analyzer):
+    return [
+        analyzer.get_top_k_popular_videos(15)['video_id'].tolist(),
+        analyzer.get_top_k_rated_videos(15, 0)['video_id'].tolist(),
+        analyzer.get_top_k_per_category(4, 'views')['video_id'].tolist(),
+        analyzer.get_top_k_per_category(4, 'rate')['video_id'].tolist(),
+    ]
+
+
+def test_append_matches_full_load(tmp_path, video_line):
+    lines = crawl_lines(video_line, 300)
+    folder = tmp_path / '0222'
+    folder.mkdir()
+    (folder / '0.txt').write_text('\n'.join(lines[:200]) + '\n')
+    
+    appended = YouTubeDataAnalyzer(str(tmp_path), query_cache_entries=0)
+    appended.load_data('0222', use_cache=False)
+    top_k_results(appended)
+    engine = appended.top_k
+    (folder / '1.txt').write_text('\n'.join(lines[200:]) + '\n')
+    assert appended.append_data('0222') == 100
+    assert appended.top_k is engine
+    
+    full = YouTubeDataAnalyzer(str(tmp_path), query_cache_entries=0)
+    full.load_data('0222', use_cache=False)
+    
+    assert top_k_results(appended) == top_k_results(full)
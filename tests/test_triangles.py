@@ -0,0 +1,57 @@
+import youtube_analyzer_complete
+from youtube_analyzer_complete import YouTubeDataAnalyzer
+
+# Two directed 3-cycles, a -> b -> c -> a and a -> c -> d -> a, plus a repeated edge and a dangling edge to e.
+RELATED = {
+    'aaaaaaaaaaa': ['bbbbbbbbbbb', 'ccccccccccc', 'bbbbbbbbbbb'],
+    'bbbbbbbbbbb': ['ccccccccccc'],
+    'ccccccccccc': ['aaaaaaaaaaa', 'ddddddddddd'],
+    'ddddddddddd': ['aaaaaaaaaaa', 'eeeeeeeeeee'],
+}
+CYCLES = {('aaaaaaaaaaa', 'bbbbbbbbbbb', 'ccccccccccc'), ('aaaaaaaaaaa', 'ccccccccccc', 'ddddddddddd')}
+
+
+def load(root, video_line):
+    (root / '0222').mkdir(exist_ok=True)
+    lines = [video_line(video_id, related) for video_id, related in RELATED.items()]
+    (root / '0222' / '0.txt').write_text('\n'.join(lines) + '\n')
+    
+    analyzer = YouTubeDataAnalyzer(str(root), query_cache_entries=0)
+    analyzer.load_data('0222', use_cache=False)
+    return analyzer
+
+
+def rotated(row):
+    """Rotate a cycle so its smallest video ID comes first."""
+    start = row.index(min(row))
+    return tuple(row[start:] + row[:start])
+
+
+def cycles(frame):
+    return {rotated(list(row)) for row in frame[['video1', 'video2', 'video3']].itertuples(index=False)}
+
+
+def test_count_and_list_triangles(tmp_path, video_line):
+    analyzer = load(tmp_path, video_line)
+    
+    assert analyzer.count_triangles() == 2
+    triangles = analyzer.find_triangles()
+    assert len(triangles) == 2
+    assert cycles(triangles) == CYCLES
+
+
+def test_seeded_limit_is_repeatable(tmp_path, video_line):
+    analyzer = load(tmp_path, video_line)
+    
+    first = analyzer.find_triangles(limit=1, seed=7)
+    assert len(first) == 1
+    assert cycles(first) <= CYCLES
+    assert first.equals(analyzer.find_triangles(limit=1, seed=7))
+
+
+def test_worker_pool_matches_single_process(tmp_path, video_line, monkeypatch):
+    monkeypatch.setattr(youtube_analyzer_complete, 'TRIANGLE_BLOCK_SIZE', 1)
+    analyzer = load(tmp_path, video_line)
+    
+    assert analyzer.count_triangles(workers=2) == 2
+    assert cycles(analyzer.find_triangles(workers=2)) == CYCLES
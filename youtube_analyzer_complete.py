@@ -1,115 +1,1478 @@
 import os
+import sys
+import json
+import time
+import atexit
+import shutil
+import tempfile
+import weakref
+import hashlib
+import inspect
+import functools
+import itertools
+import threading
+import contextlib
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import networkx as nx
 from typing import List, Dict, Set, Tuple, Optional
-from collections import defaultdict
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+VIDEO_COLUMNS = ['video_id', 'uploader', 'age', 'category', 'length', 'views',
+                 'rate', 'ratings', 'comments', 'related_ids']
+VIDEO_INT_COLUMNS = {'age': 2, 'length': 4, 'views': 5, 'ratings': 7, 'comments': 8}
+VIDEO_NARROW_COLUMNS = ['age', 'length', 'ratings', 'comments']
+SNAPSHOT_COLUMNS = ['uploader', 'age', 'category', 'length', 'views', 'rate', 'ratings', 'comments']
+VIDEO_CHUNK_BYTES = 64 * 1024 * 1024
+SNAPSHOT_DIRNAME = '.snapshot'
+SNAPSHOT_VERSION = 3
+GRAPH_STORE_VERSION = 1
+TRIANGLE_BLOCK_SIZE = 8192
+TOP_K_CACHE_DEPTH = 100
+STREAM_CHUNK_ROWS = 100000
+INTERNER_MAX_SEGMENTS = 8
+RANGE_INDEX_MAX_RUNS = 8
+LAYOUT_ITERATIONS = 50
+LAYOUT_REPULSION_SAMPLES = 32
+LAYOUT_CACHE_SIZE = 16
+QUERY_CACHE_ENTRIES = 128
+QUERY_CACHE_BYTES = 256 * 1024 * 1024
+CENTRALITY_COLUMNS = ['pagerank', 'reach', 'hub', 'authority']
+PAGERANK_DAMPING = 0.85
+CENTRALITY_TOLERANCE = 1e-6
+CENTRALITY_MAX_ITERATIONS = 100
+LANCZOS_STEPS = 20
+UPLOADER_MEASURES = ['views', 'ratings', 'comments', 'length', 'rate']
+PROFILE_ENV_VAR = 'YTA_PROFILE'
+PROFILE_MAX_RECORDS = 100000
+BATCH_QUERIES = ('get_top_k_categories', 'get_top_k_rated_videos', 'get_top_k_popular_videos',
+                 'get_top_k_per_category', 'find_videos_by_category_and_duration', 'query_range',
+                 'find_videos_by_size_range', 'find_recommendation_patterns', 'count_triangles',
+                 'find_triangles', 'get_uploader_clusters', 'get_same_uploader_pairs',
+                 'get_friend_components', 'get_friend_degree_distribution', 'count_mutual_friends',
+                 'get_top_k_connected_users', 'get_top_k_central_videos', 'get_top_k_uploaders',
+                 'get_uploader_categories', 'memory_report')
+
+
+def _parse_video_text(text: str):
+    """Parse crawl lines into a typed video frame without building per-row objects."""
+    lines = pd.Series(text.split('\n'), dtype=object).str.strip()
+    parts = lines.str.split('\t', n=9, expand=True)
+    
+    if parts.shape[1] < 10:
+        return pd.DataFrame({column: [] for column in VIDEO_COLUMNS})
+    
+    parts = parts[parts[9].notna()]
+    
+    columns = {
+        'video_id': parts[0].to_numpy(dtype=object),
+        'uploader': parts[1].to_numpy(dtype=object),
+        'category': parts[3].to_numpy(dtype=object),
+        'related_ids': parts[9].str.replace('\t', ',', regex=False).to_numpy(dtype=object),
+    }
+    
+    for column, position in VIDEO_INT_COLUMNS.items():
+        field = parts[position]
+        columns[column] = field.where(field.str.isdigit(), '0').to_numpy(dtype=object).astype(np.int64)
+    
+    rate = parts[6]
+    rate_valid = rate.str.replace('.', '', n=1, regex=False).str.isdigit()
+    columns['rate'] = rate.where(rate_valid, '0').to_numpy(dtype=object).astype(np.float64)
+    
+    return pd.DataFrame({column: columns[column] for column in VIDEO_COLUMNS})
+
+
+def _video_file_chunks(file_path: str, chunk_bytes: int = VIDEO_CHUNK_BYTES, start: int = 0, file_size: int = None):
+    """Split a crawl file (from byte start, a line boundary) into byte ranges that start and end on line boundaries."""
+    if file_size is None:
+        file_size = os.path.getsize(file_path)
+    bounds = [start]
+    
+    with open(file_path, 'rb') as f:
+        while bounds[-1] + chunk_bytes < file_size:
+            f.seek(bounds[-1] + chunk_bytes)
+            f.readline()
+            if f.tell() >= file_size:
+                break
+            bounds.append(f.tell())
+    
+    bounds.append(file_size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _complete_length(file_path: str):
+    """Byte length of the file up to and including its last newline, so a line still being written is left out."""
+    file_size = os.path.getsize(file_path)
+    
+    with open(file_path, 'rb') as f:
+        position = file_size
+        while position > 0:
+            block_start = max(position - 65536, 0)
+            f.seek(block_start)
+            newline = f.read(position - block_start).rfind(b'\n')
+            if newline >= 0:
+                return block_start + newline + 1
+            position = block_start
+    
+    return 0
+
+
+def _report_unterminated_lines(lengths: Dict[str, int]):
+    """Print each file whose last line has no newline yet; load_data holds it back for a later append_data."""
+    for file_path, length in lengths.items():
+        held_back = os.path.getsize(file_path) - length
+        if held_back:
+            print(f"Held back an unterminated last line ({held_back} bytes) in {file_path}; "
+                  f"it is loaded by append_data once a newline follows it")
+
+
+def _parse_video_chunk(file_path: str, start: int, end: int):
+    began = time.perf_counter()
+    
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        raw = f.read(end - start)
+    
+    text = raw.decode('utf-8', errors='ignore').replace('\r\n', '\n').replace('\r', '\n')
+    return _parse_video_text(text), time.perf_counter() - began
+
+
+def _lines_up_to(f, limit: int = None):
+    """Iterate the lines of binary file f, stopping once limit bytes have been returned."""
+    for line in f:
+        if limit is not None:
+            limit -= len(line)
+            if limit < 0:
+                return
+        yield line
+
+
+def _iter_video_frames(data_paths: List[str], chunk_rows: int = STREAM_CHUNK_ROWS, lengths: Dict[str, int] = None,
+                       skip_rows=None):
+    """Yield parsed video frames of at most chunk_rows lines, indexed by global row position."""
+    # lengths caps how much of each file is read; skip_rows holds parsed-row numbers (before skipping) to drop.
+    parsed, position = 0, 0
+    for file_path in data_paths:
+        with open(file_path, 'rb') as f:
+            lines_iter = _lines_up_to(f, lengths[file_path] if lengths is not None else None)
+            while True:
+                lines = list(itertools.islice(lines_iter, chunk_rows))
+                if not lines:
+                    break
+                
+                text = b''.join(lines).decode('utf-8', errors='ignore').replace('\r\n', '\n').replace('\r', '\n')
+                frame = _parse_video_text(text)
+                rows = np.arange(parsed, parsed + len(frame))
+                parsed += len(frame)
+                if skip_rows is not None and len(skip_rows):
+                    frame = frame[~np.isin(rows, skip_rows)]
+                frame.index = pd.RangeIndex(position, position + len(frame))
+                position += len(frame)
+                
+                if len(frame):
+                    yield frame
+
+
+def _map_spill_file(path: str):
+    """Memory-map an int32 spill file read-only; mmap rejects empty files, so those load as empty arrays."""
+    if os.path.getsize(path) == 0:
+        return np.zeros(0, dtype=np.int32)
+    return np.memmap(path, dtype=np.int32, mode='r')
+
+
+def _expand_ranges(starts, lengths):
+    """Concatenate arange(start, start + length) for every (start, length) pair."""
+    total = int(lengths.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+    
+    shifts = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    return np.arange(total, dtype=np.int64) + shifts
+
+
+def _triangle_block(sources, offsets, targets, edge_keys, list_triangles: bool = False):
+    """Find directed 3-cycles u -> v -> w -> u whose smallest node u is in sources."""
+    node_count = len(offsets) - 1
+    
+    degrees = offsets[sources + 1] - offsets[sources]
+    u = np.repeat(sources, degrees)
+    v = targets[_expand_ranges(offsets[sources], degrees)]
+    
+    higher = v > u
+    u, v = u[higher], v[higher]
+    
+    degrees = offsets[v + 1] - offsets[v]
+    w = targets[_expand_ranges(offsets[v], degrees)]
+    u, v = np.repeat(u, degrees), np.repeat(v, degrees)
+    
+    higher = w > u
+    u, v, w = u[higher], v[higher], w[higher]
+    
+    closing = w * node_count + u
+    positions = np.minimum(np.searchsorted(edge_keys, closing), len(edge_keys) - 1)
+    closed = edge_keys[positions] == closing
+    
+    if list_triangles:
+        return np.column_stack([u[closed], v[closed], w[closed]])
+    return int(closed.sum())
+
+
+def _connected_components(node_count: int, sources, targets):
+    """Label nodes with the smallest node of their component using vectorized union-find (hook and compress)."""
+    parent = np.arange(node_count, dtype=np.int64)
+    
+    while True:
+        source_roots, target_roots = parent[sources], parent[targets]
+        low = np.minimum(source_roots, target_roots)
+        high = np.maximum(source_roots, target_roots)
+        
+        merging = low != high
+        if not merging.any():
+            return parent
+        
+        np.minimum.at(parent, high[merging], low[merging])
+        
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+
+def _pagerank(offsets, targets, damping: float = PAGERANK_DAMPING, tolerance: float = CENTRALITY_TOLERANCE,
+              max_iterations: int = CENTRALITY_MAX_ITERATIONS):
+    """PageRank by power iteration over a CSR graph, spreading the rank of dangling nodes uniformly."""
+    node_count = len(offsets) - 1
+    out_degree = np.diff(offsets)
+    rows = np.flatnonzero(out_degree)
+    dangling = out_degree == 0
+    
+    rank = np.full(node_count, 1.0 / node_count)
+    for iteration in range(1, max_iterations + 1):
+        shares = np.repeat(rank[rows] / out_degree[rows], out_degree[rows])
+        spread = (1.0 - damping + damping * rank[dangling].sum()) / node_count
+        new_rank = damping * np.bincount(targets, shares, minlength=node_count) + spread
+        change = np.abs(new_rank - rank).sum()
+        rank = new_rank
+        if change < tolerance:
+            break
+    
+    return rank, iteration
+
+
+def _dominant_eigenvector(matvec, start, tolerance: float = CENTRALITY_TOLERANCE,
+                          max_iterations: int = CENTRALITY_MAX_ITERATIONS, steps: int = LANCZOS_STEPS):
+    """Dominant eigenvector of a symmetric positive semi-definite operator by restarted Lanczos iteration."""
+    steps = min(steps, len(start))
+    basis = np.zeros((steps + 1, len(start)))
+    vector = start / np.linalg.norm(start)
+    products = 0
+    
+    while True:
+        basis[0] = vector
+        alpha, beta = np.zeros(steps), np.zeros(steps)
+        for size in range(1, steps + 1):
+            product = matvec(basis[size - 1])
+            products += 1
+            alpha[size - 1] = basis[size - 1] @ product
+            scale = np.linalg.norm(product)
+            product -= basis[:size].T @ (basis[:size] @ product)
+            beta[size - 1] = np.linalg.norm(product)
+            # A residual at rounding level means the Krylov space is exhausted; more steps would only add noise.
+            exhausted = beta[size - 1] <= np.sqrt(np.finfo(np.float64).eps) * scale
+            if exhausted:
+                beta[size - 1] = 0.0
+            if exhausted or products >= max_iterations:
+                break
+            basis[size] = product / beta[size - 1]
+        
+        tridiagonal = np.diag(alpha[:size]) + np.diag(beta[:size - 1], 1) + np.diag(beta[:size - 1], -1)
+        values, vectors = np.linalg.eigh(tridiagonal)
+        vector = vectors[:, -1] @ basis[:size]
+        vector /= np.linalg.norm(vector)
+        
+        if beta[size - 1] * abs(vectors[-1, -1]) <= tolerance * values[-1] or products >= max_iterations:
+            return vector * np.sign(vector.sum()), products
+
+
+def _hits(offsets, targets, tolerance: float = CENTRALITY_TOLERANCE, max_iterations: int = CENTRALITY_MAX_ITERATIONS):
+    """HITS hub and authority scores, each summing to one, with hubs from the dominant eigenvector of A A^T."""
+    node_count = len(offsets) - 1
+    out_degree = np.diff(offsets)
+    rows = np.flatnonzero(out_degree)
+    hub, authority = np.zeros(node_count), np.zeros(node_count)
+    if len(rows) == 0:
+        return hub, authority, 0
+    
+    degrees, starts = out_degree[rows], offsets[rows]
+    
+    def authorities(row_hubs):
+        return np.bincount(targets, np.repeat(row_hubs, degrees), minlength=node_count)
+    
+    row_hubs, products = _dominant_eigenvector(lambda row_hubs: np.add.reduceat(authorities(row_hubs)[targets], starts),
+                                               np.full(len(rows), 1.0), tolerance, max_iterations)
+    hub[rows] = np.maximum(row_hubs, 0.0)
+    hub /= hub.sum()
+    authority = authorities(hub[rows])
+    authority /= authority.sum()
+    
+    return hub, authority, products
+
+
+def _force_layout(node_count: int, sources, targets, iterations: int = LAYOUT_ITERATIONS, seed: int = 42):
+    """Fruchterman-Reingold layout with sampled repulsion, so each iteration costs O(nodes + edges)."""
+    rng = np.random.default_rng(seed)
+    pos = rng.random((node_count, 2))
+    if node_count < 2:
+        return pos
+    
+    k = 1.0 / np.sqrt(node_count)
+    samples = min(LAYOUT_REPULSION_SAMPLES, node_count - 1)
+    scale = (node_count - 1) / samples
+    rows = np.arange(node_count)[:, None]
+    temperature = 0.1
+    
+    for _ in range(iterations):
+        others = rng.integers(0, node_count - 1, size=(node_count, samples))
+        others += others >= rows
+        
+        delta = pos[:, None, :] - pos[others]
+        distance2 = np.maximum((delta ** 2).sum(axis=2), 1e-6)
+        displacement = scale * k * k * (delta / distance2[:, :, None]).sum(axis=1)
+        
+        edge_delta = pos[sources] - pos[targets]
+        edge_distance = np.sqrt(np.maximum((edge_delta ** 2).sum(axis=1), 1e-9))
+        pull = edge_delta * (edge_distance / k)[:, None]
+        for axis in range(2):
+            displacement[:, axis] -= np.bincount(sources, pull[:, axis], minlength=node_count)
+            displacement[:, axis] += np.bincount(targets, pull[:, axis], minlength=node_count)
+        
+        displacement -= pos - pos.mean(axis=0)
+        
+        length = np.maximum(np.sqrt((displacement ** 2).sum(axis=1)), 1e-9)
+        pos += displacement * (np.minimum(length, temperature) / length)[:, None]
+        temperature -= 0.1 / (iterations + 1)
+    
+    pos -= pos.mean(axis=0)
+    return pos / max(np.abs(pos).max(), 1e-9)
+
+
+_TRIANGLE_GRAPH = None
+
+
+def _init_triangle_worker(offsets, targets, edge_keys):
+    global _TRIANGLE_GRAPH
+    _TRIANGLE_GRAPH = (offsets, targets, edge_keys)
+
+
+def _triangle_worker_block(sources, list_triangles: bool):
+    return _triangle_block(sources, *_TRIANGLE_GRAPH, list_triangles)
+
+
+class VideoRangeIndex:
+    """Argsorted numeric video columns, partitioned by category, in one sorted run per append for range queries."""
+    
+    def __init__(self, video_df, columns: Tuple[str, ...] = ('length', 'views', 'size', 'rate')):
+        self.columns = columns
+        self.runs = [self._build_run(video_df, 0)]
+    
+    def _build_run(self, video_df, start: int):
+        frame = video_df.iloc[start:]
+        category_codes, categories = pd.factorize(frame['category'])
+        bins = np.arange(len(categories) + 1)
+        
+        # Missing values never satisfy a range, so they are left out of the index entirely.
+        sorted_columns = {}
+        for column in self.columns:
+            if column not in frame.columns:
+                continue
+            
+            values = frame[column].to_numpy()
+            present = np.flatnonzero(pd.notna(values))
+            order = present[np.argsort(values[present], kind='stable')]
+            partitioned = present[np.lexsort((values[present], category_codes[present]))]
+            category_bounds = np.searchsorted(category_codes[partitioned], bins)
+            sorted_columns[column] = (order + start, values[order], partitioned + start, values[partitioned],
+                                      category_bounds)
+        
+        return pd.Index(categories), sorted_columns
+    
+    @property
+    def sorted_columns(self):
+        return self.runs[0][1]
+    
+    def extend(self, video_df, start: int):
+        """Index rows appended to video_df at positions >= start."""
+        if len(self.runs) >= RANGE_INDEX_MAX_RUNS:
+            self.runs = [self._build_run(video_df, 0)]
+        else:
+            self.runs.append(self._build_run(video_df, start))
+    
+    def positions(self, column: str, min_value=None, max_value=None, category: str = None):
+        """Return ascending row positions whose column value lies in [min_value, max_value]."""
+        matches = [self._run_positions(run, column, min_value, max_value, category) for run in self.runs]
+        return np.sort(np.concatenate(matches)) if len(matches) > 1 else np.sort(matches[0])
+    
+    @staticmethod
+    def _run_positions(run, column: str, min_value, max_value, category: str):
+        categories, sorted_columns = run
+        order, values, partitioned, partitioned_values, category_bounds = sorted_columns[column]
+        
+        start, end = 0, len(values)
+        if category is not None:
+            if category not in categories:
+                return np.zeros(0, dtype=np.int64)
+            
+            code = categories.get_loc(category)
+            start, end = category_bounds[code], category_bounds[code + 1]
+            order, values = partitioned, partitioned_values
+        
+        # Compare in the column's own float width, so a float32 (compacted) 4.34 still matches a bound of 4.34.
+        if values.dtype.kind == 'f':
+            min_value = None if min_value is None else values.dtype.type(min_value)
+            max_value = None if max_value is None else values.dtype.type(max_value)
+        
+        low = start if min_value is None else start + np.searchsorted(values[start:end], min_value, 'left')
+        high = end if max_value is None else start + np.searchsorted(values[start:end], max_value, 'right')
+        
+        return order[low:high]
+
+
+class VideoIdInterner:
+    """Maps video ID strings to dense integer codes, growing in append-only hash-indexed segments."""
+    
+    def __init__(self, ids=None):
+        self.segments = []
+        self.size = 0
+        if ids is not None and len(ids):
+            self._add_segment(np.asarray(ids, dtype=object))
+    
+    def _add_segment(self, ids):
+        self.segments.append((self.size, pd.Index(ids)))
+        self.size += len(ids)
+        
+        if len(self.segments) > INTERNER_MAX_SEGMENTS:
+            self.segments = [(0, pd.Index(self.ids))]
+    
+    @property
+    def ids(self):
+        return self.ids_since(0)
+    
+    def ids_since(self, start: int):
+        """IDs with codes >= start, in code order."""
+        parts = [index.to_numpy(dtype=object)[max(start - offset, 0):]
+                 for offset, index in self.segments if offset + len(index) > start]
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=object)
+    
+    def lookup(self, values):
+        """Return the code of each value, or -1 for values that were never interned."""
+        codes = np.full(len(values), -1, dtype=np.int64)
+        for start, index in self.segments:
+            missing = np.flatnonzero(codes < 0)
+            if len(missing) == 0:
+                break
+            found = index.get_indexer(values[missing])
+            codes[missing[found >= 0]] = found[found >= 0] + start
+        return codes
+    
+    def intern(self, values):
+        """Return codes for values, assigning new codes to unseen IDs in first-appearance order."""
+        values = np.asarray(values, dtype=object)
+        codes = self.lookup(values)
+        
+        missing = codes < 0
+        if missing.any():
+            new_codes, new_ids = pd.factorize(values[missing])
+            codes[missing] = new_codes + self.size
+            self._add_segment(np.asarray(new_ids, dtype=object))
+        
+        return codes
+
+
+class EncodedVideoIds:
+    """Read-only video ID table over a UTF-8 bytes array (e.g. a memmap) that decodes only the entries indexed."""
+    
+    def __init__(self, encoded):
+        self.encoded = encoded
+        self.dtype = encoded.dtype
+        self.nbytes = encoded.nbytes
+    
+    def __len__(self):
+        return len(self.encoded)
+    
+    def __getitem__(self, key):
+        selected = self.encoded[key]
+        if isinstance(selected, bytes):
+            return selected.decode('utf-8')
+        return np.char.decode(selected, 'utf-8').astype(object)
+    
+    def __array__(self, dtype=None, copy=None):
+        ids = self[:]
+        return ids if dtype is None else ids.astype(dtype)
+
+
+class TopKEngine:
+    """Cached top-K rankings over video_df that absorb appended rows without a full re-sort."""
+    
+    def __init__(self, video_df):
+        self.video_df = video_df
+        self.rankings = {}
+        self.category_counts = None
+    
+    def _candidates(self, key, positions):
+        if key[0] == 'rated':
+            ratings = self.video_df['ratings'].to_numpy()
+            return positions[ratings[positions] >= key[1]]
+        return positions
+    
+    def _rank(self, key, candidates, depth: int):
+        """Order candidates by the key's columns (descending), then by row position."""
+        if key[0] == 'rated':
+            primary = self.video_df['rate'].to_numpy()[candidates]
+            secondary = self.video_df['ratings'].to_numpy()[candidates]
+        else:
+            primary = self.video_df[key[1]].to_numpy()[candidates]
+            secondary = np.zeros(len(candidates), dtype=np.int8)
+        
+        if key[0] == 'per_category':
+            codes = pd.factorize(self.video_df['category'].iloc[candidates].to_numpy(dtype=object), sort=True)[0]
+            order = np.lexsort((candidates, -primary, codes))
+            codes = codes[order]
+            
+            starts = np.r_[True, codes[1:] != codes[:-1]] if len(codes) else np.zeros(0, dtype=bool)
+            positions = np.arange(len(codes))
+            ranks = positions - np.maximum.accumulate(np.where(starts, positions, 0))
+            
+            keep = ranks < depth
+            return candidates[order][keep], ranks[keep]
+        
+        if len(candidates) > depth:
+            kth = np.partition(primary, len(primary) - depth)[len(primary) - depth]
+            within = primary >= kth
+            candidates, primary, secondary = candidates[within], primary[within], secondary[within]
+        
+        order = np.lexsort((candidates, -secondary, -primary))[:depth]
+        return candidates[order], np.arange(len(order))
+    
+    def top_positions(self, key, k: int):
+        """Return (row positions, rank within group) for the top k rows of a ranking key."""
+        entry = self.rankings.get(key)
+        if entry is None or entry[0] < k:
+            depth = max(k, TOP_K_CACHE_DEPTH)
+            candidates = self._candidates(key, np.arange(len(self.video_df)))
+            entry = (depth,) + self._rank(key, candidates, depth)
+            self.rankings[key] = entry
+        
+        _, positions, ranks = entry
+        keep = ranks < k
+        return positions[keep], ranks[keep]
+    
+    def top_categories(self, k: int):
+        if self.category_counts is None:
+            counts = self.video_df['category'].value_counts(sort=False)
+            counts.index = pd.Index(counts.index.to_numpy(dtype=object), name=counts.index.name)
+            self.category_counts = counts[counts > 0]
+        
+        counts = self.category_counts.sort_values(ascending=False, kind='stable')
+        return counts.head(k)
+    
+    def extend(self, video_df, start: int):
+        """Merge rows appended at positions >= start into every cached ranking."""
+        self.video_df = video_df
+        new_positions = np.arange(start, len(video_df))
+        
+        for key, (depth, positions, _) in list(self.rankings.items()):
+            candidates = np.union1d(positions, self._candidates(key, new_positions))
+            self.rankings[key] = (depth,) + self._rank(key, candidates, depth)
+        
+        if self.category_counts is not None:
+            new_counts = video_df['category'].iloc[start:].value_counts(sort=False)
+            self.category_counts = pd.concat([self.category_counts, new_counts]).groupby(level=0, sort=False).sum()
+
+
+class UploaderCube:
+    """Video counts and integer measure sums (rate in hundredths) per (uploader, category) cell, sorted by key."""
+    
+    def __init__(self, video_df=None):
+        self.uploaders = VideoIdInterner()
+        self.categories = VideoIdInterner()
+        self.cell_keys = np.zeros(0, dtype=np.int64)
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.sums = np.zeros((0, len(UPLOADER_MEASURES)), dtype=np.int64)
+        if video_df is not None:
+            self.add(video_df)
+    
+    def add(self, frame):
+        """Fold the rows of frame into their cells, creating cells for unseen uploader/category pairs."""
+        uploaders = frame['uploader'].to_numpy(dtype=object)
+        valid = pd.notna(uploaders) & (uploaders != '')
+        if not valid.any():
+            return
+        
+        uploader_codes = self.uploaders.intern(uploaders[valid])
+        category_codes = self.categories.intern(frame['category'].to_numpy(dtype=object)[valid])
+        cells, keys = pd.factorize((uploader_codes << 32) | category_codes)
+        
+        counts = np.bincount(cells, minlength=len(keys))
+        sums = np.zeros((len(keys), len(UPLOADER_MEASURES)), dtype=np.int64)
+        for position, measure in enumerate(UPLOADER_MEASURES):
+            values = frame[measure].to_numpy(dtype=np.float64)[valid]
+            if measure == 'rate':
+                values = np.round(values * 100)
+            sums[:, position] = np.bincount(cells, values, minlength=len(keys))
+        
+        positions = np.searchsorted(self.cell_keys, keys)
+        existing = positions < len(self.cell_keys)
+        existing[existing] = self.cell_keys[positions[existing]] == keys[existing]
+        self.counts[positions[existing]] += counts[existing]
+        self.sums[positions[existing]] += sums[existing]
+        
+        if not existing.all():
+            cell_keys = np.concatenate([self.cell_keys, keys[~existing]])
+            order = np.argsort(cell_keys, kind='stable')
+            self.cell_keys = cell_keys[order]
+            self.counts = np.concatenate([self.counts, counts[~existing]])[order]
+            self.sums = np.concatenate([self.sums, sums[~existing]])[order]
+    
+    def category_code(self, category: str):
+        return self.categories.lookup(np.array([category], dtype=object))[0]
+    
+    def uploader_totals(self, category: str = None):
+        """Return (uploader codes, video counts, measure sums) over all categories or within one."""
+        cell_uploaders = self.cell_keys >> 32
+        if category is not None:
+            cells = np.flatnonzero((self.cell_keys & 0xFFFFFFFF) == self.category_code(category))
+            return cell_uploaders[cells], self.counts[cells], self.sums[cells]
+        
+        if len(cell_uploaders) == 0:
+            return cell_uploaders, self.counts, self.sums
+        starts = np.flatnonzero(np.r_[True, cell_uploaders[1:] != cell_uploaders[:-1]])
+        return cell_uploaders[starts], np.add.reduceat(self.counts, starts), np.add.reduceat(self.sums, starts)
+    
+    def uploader_cells(self, uploader: str):
+        """Return (category codes, video counts, measure sums) of one uploader's cells."""
+        code = self.uploaders.lookup(np.array([uploader], dtype=object))[0]
+        start, end = np.searchsorted(self.cell_keys, [code << 32, (code + 1) << 32]) if code >= 0 else (0, 0)
+        return self.cell_keys[start:end] & 0xFFFFFFFF, self.counts[start:end], self.sums[start:end]
+    
+    def frame(self, counts, sums, **labels):
+        """Label columns followed by videos, then the sum and mean of every measure."""
+        columns = dict(labels, videos=counts)
+        for position, measure in enumerate(UPLOADER_MEASURES):
+            total = sums[:, position] / 100 if measure == 'rate' else sums[:, position]
+            columns[f'{measure}_sum'] = total
+            columns[f'{measure}_mean'] = total / np.maximum(counts, 1)
+        return pd.DataFrame(columns)
+
+
+class SnapshotSeries:
+    """Video snapshots aligned on sorted video_id: unchanged columns stored once, changing ones as snapshot x video arrays."""
+    
+    def __init__(self, labels: List[str], frames: List[pd.DataFrame]):
+        self.labels = list(labels)
+        frame_ids = [frame['video_id'].to_numpy(dtype=str) for frame in frames]
+        self.video_ids = np.unique(np.concatenate(frame_ids))
+        
+        snapshot_count, video_count = len(frames), len(self.video_ids)
+        self.present = np.zeros((snapshot_count, video_count), dtype=bool)
+        
+        alignments = []
+        for snapshot, ids in enumerate(frame_ids):
+            order = np.argsort(ids, kind='stable')
+            sorted_ids = ids[order]
+            first = np.ones(len(sorted_ids), dtype=bool)
+            first[1:] = sorted_ids[1:] != sorted_ids[:-1]
+            
+            rows = order[first]
+            columns = np.searchsorted(self.video_ids, sorted_ids[first])
+            self.present[snapshot, columns] = True
+            alignments.append((rows, columns))
+        
+        self.first_seen = np.argmax(self.present, axis=0)
+        self.static = {}
+        self.series = {}
+        self.dtypes = {column: frames[0][column].dtype for column in SNAPSHOT_COLUMNS}
+        
+        video_positions = np.arange(video_count)
+        for column in SNAPSHOT_COLUMNS:
+            numeric = pd.api.types.is_numeric_dtype(frames[0][column])
+            values = np.full((snapshot_count, video_count), np.nan if numeric else None,
+                             dtype=np.float64 if numeric else object)
+            for snapshot, (rows, columns) in enumerate(alignments):
+                values[snapshot, columns] = frames[snapshot][column].to_numpy()[rows]
+            
+            baseline = values[self.first_seen, video_positions]
+            if np.all((values == baseline) | ~self.present):
+                self.static[column] = baseline
+            else:
+                self.series[column] = values
+    
+    def snapshot_index(self, snapshot):
+        """Position of a snapshot given by label or index (negative indexes count from the last one)."""
+        if isinstance(snapshot, str):
+            return self.labels.index(snapshot)
+        return range(len(self.labels))[snapshot]
+    
+    def values(self, column: str):
+        """Snapshot x video array of column, valid where present; unchanged columns are a read-only broadcast view."""
+        if column in self.series:
+            return self.series[column]
+        return np.broadcast_to(self.static[column], self.present.shape)
+    
+    def deltas(self, column: str, start=0, end=-1):
+        """Per-video start value, end value, change and relative growth for videos present in both snapshots."""
+        start, end = self.snapshot_index(start), self.snapshot_index(end)
+        values = self.values(column)
+        
+        both = np.flatnonzero(self.present[start] & self.present[end])
+        start_values, end_values = values[start, both], values[end, both]
+        if pd.api.types.is_integer_dtype(self.dtypes[column]):
+            start_values, end_values = start_values.astype(np.int64), end_values.astype(np.int64)
+        delta = end_values - start_values
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            growth = np.where(start_values > 0, delta / start_values, np.nan)
+        
+        return both, start_values, end_values, delta, growth
+    
+    def attribute(self, column: str, positions):
+        """Value of a descriptive column for videos at positions, taken from the latest snapshot containing each."""
+        if column in self.static:
+            return self.static[column][positions]
+        last_seen = len(self.labels) - 1 - np.argmax(self.present[::-1, positions], axis=0)
+        return self.series[column][last_seen, positions]
+
+
+class QueryCache:
+    """Size-bounded LRU cache of query results keyed on (method, arguments, data version), with hit/miss counts."""
+    
+    def __init__(self, max_entries: int = QUERY_CACHE_ENTRIES, max_bytes: int = QUERY_CACHE_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.data_version = None
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+    
+    @staticmethod
+    def _result_bytes(result):
+        if isinstance(result, pd.DataFrame):
+            return int(result.memory_usage(index=True).sum())
+        return 0
+    
+    def get(self, key):
+        """Return (True, result) and mark the entry most recently used, or (False, None) on a miss."""
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return True, self.entries[key][0]
+            self.misses += 1
+            return False, None
+    
+    def put(self, key, result):
+        size = self._result_bytes(result)
+        if size > self.max_bytes:
+            return
+        
+        with self.lock:
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)[1]
+            self.entries[key] = (result, size)
+            self.total_bytes += size
+            
+            while len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                self.total_bytes -= self.entries.popitem(last=False)[1][1]
+    
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+    
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self.entries), 'bytes': self.total_bytes}
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process so far (None where the resource module is unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class StageProfiler:
+    """Records wall time, CPU time, peak RSS and row/edge counts of named, nested stages."""
+    
+    def __init__(self, enabled: bool = False, max_records: int = PROFILE_MAX_RECORDS):
+        self.enabled = enabled
+        self.records = deque(maxlen=max_records)
+        self.origin = time.perf_counter()
+        self.lock = threading.Lock()
+        self.local = threading.local()
+    
+    @contextlib.contextmanager
+    def stage(self, name: str, **counts):
+        """Record the enclosed block as one stage; counts added to the yielded dict are kept with it."""
+        if not self.enabled:
+            yield counts
+            return
+        
+        stack = self.local.__dict__.setdefault('stack', [])
+        parent = stack[-1][0] if stack else None
+        stack.append((name, counts))
+        peak_before = peak_rss_bytes()
+        wall_started, cpu_started = time.perf_counter(), time.thread_time()
+        try:
+            yield counts
+        finally:
+            wall, cpu = time.perf_counter() - wall_started, time.thread_time() - cpu_started
+            stack.pop()
+            peak = peak_rss_bytes()
+            record = {
+                'stage': name,
+                'parent': parent,
+                'thread': threading.get_native_id(),
+                'start_seconds': wall_started - self.origin,
+                'wall_seconds': wall,
+                'cpu_seconds': cpu,
+                'peak_rss_bytes': peak,
+                'peak_rss_growth_bytes': peak - peak_before if peak is not None else None
+            }
+            record.update(counts)
+            with self.lock:
+                self.records.append(record)
+    
+    def count(self, **counts):
+        """Attach row/edge counts to the innermost running stage of the calling thread."""
+        stack = getattr(self.local, 'stack', None)
+        if self.enabled and stack:
+            stack[-1][1].update(counts)
+    
+    def clear(self):
+        with self.lock:
+            self.records.clear()
+            self.origin = time.perf_counter()
+    
+    def report(self):
+        """Per-stage call count, total and slowest wall time, total CPU time and highest peak RSS."""
+        with self.lock:
+            records = pd.DataFrame(list(self.records), columns=['stage', 'wall_seconds', 'cpu_seconds', 'peak_rss_bytes'])
+        
+        report = records.groupby('stage', sort=False).agg(
+            calls=('wall_seconds', 'size'),
+            wall_seconds=('wall_seconds', 'sum'),
+            max_wall_seconds=('wall_seconds', 'max'),
+            cpu_seconds=('cpu_seconds', 'sum'),
+            peak_rss_bytes=('peak_rss_bytes', 'max')
+        )
+        return report.sort_values(by='wall_seconds', ascending=False, kind='stable').reset_index()
+    
+    def export(self, path: str, format: str = None):
+        """Write the records as JSON, or as a Chrome trace (chrome://tracing, Perfetto) for *.trace.json paths."""
+        format = format or ('chrome' if path.endswith('.trace.json') else 'json')
+        with self.lock:
+            records = list(self.records)
+        
+        if format == 'chrome':
+            pid = os.getpid()
+            document = {'displayTimeUnit': 'ms', 'traceEvents': [
+                {'name': record['stage'], 'cat': 'stage', 'ph': 'X', 'pid': pid, 'tid': record['thread'],
+                 'ts': record['start_seconds'] * 1e6, 'dur': record['wall_seconds'] * 1e6,
+                 'args': {key: value for key, value in record.items()
+                          if key not in ('stage', 'thread', 'start_seconds', 'wall_seconds')}}
+                for record in records]}
+        else:
+            document = {'pid': os.getpid(), 'stages': records}
+        
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=None if format == 'chrome' else 2,
+                      default=lambda value: value.item() if isinstance(value, np.generic) else str(value))
+        print(f"Profile of {len(records)} stages written to {path}")
+
+
+_ENVIRONMENT_PROFILER = None
+
+
+def _environment_profiler():
+    """The process-wide profiler set up by YTA_PROFILE: 1 records, a file path also exports at exit."""
+    global _ENVIRONMENT_PROFILER
+    if _ENVIRONMENT_PROFILER is None:
+        setting = os.environ.get(PROFILE_ENV_VAR, '')
+        _ENVIRONMENT_PROFILER = StageProfiler(setting not in ('', '0'))
+        if setting not in ('', '0', '1'):
+            atexit.register(_ENVIRONMENT_PROFILER.export, setting)
+    return _ENVIRONMENT_PROFILER
+
+
+def _profiled(stage: str = None):
+    """Record each call of an analyzer method as a profiler stage named after it, or stage formatted with its arguments."""
+    def decorate(method):
+        signature = inspect.signature(method)
+        
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not self.profiler.enabled:
+                return method(self, *args, **kwargs)
+            
+            name = method.__name__
+            if stage is not None:
+                bound = signature.bind(self, *args, **kwargs)
+                bound.apply_defaults()
+                name = stage.format(**bound.arguments)
+            
+            with self.profiler.stage(name) as counts:
+                result = method(self, *args, **kwargs)
+                if isinstance(result, pd.DataFrame):
+                    counts.setdefault('rows', len(result))
+            return result
+        
+        return wrapper
+    return decorate
+
+
+def _cached_query(method):
+    """Serve repeated calls of an analyzer method from its query cache until the loaded data changes."""
+    signature = inspect.signature(method)
+    
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.query_cache is None:
+            return method(self, *args, **kwargs)
+        
+        if self.query_cache.data_version != self._data_version:
+            self.query_cache.clear()
+            self.query_cache.data_version = self._data_version
+        
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (method.__name__, repr(list(bound.arguments.items())[1:]), self._data_version)
+        
+        found, result = self.query_cache.get(key)
+        if not found:
+            result = method(self, *args, **kwargs)
+            if result is not None:
+                self.query_cache.put(key, result)
+        
+        # A deep copy: without copy-on-write (pandas < 3) a shallow one would let callers edit the cached frame.
+        return result.copy() if isinstance(result, pd.DataFrame) else result
+    
+    return wrapper
+
+
+class _LazyDataset:
+    """Analyzer attribute that runs the pending load_data(lazy=True) load for its dataset on first read."""
+    
+    def __init__(self, dataset: str):
+        self.dataset = dataset
+    
+    def __set_name__(self, owner, name):
+        self.attribute = '_' + name
+    
+    def __get__(self, analyzer, owner=None):
+        if analyzer is None:
+            return self
+        if self.dataset in analyzer._pending_loads:
+            analyzer._load_pending(self.dataset)
+        return analyzer.__dict__.get(self.attribute)
+    
+    def __set__(self, analyzer, value):
+        analyzer.__dict__[self.attribute] = value
+        analyzer._data_version += 1
+
 
 class YouTubeDataAnalyzer:
     
-    def __init__(self, data_directory: str):
+    video_df = _LazyDataset('video')
+    streaming = _LazyDataset('video')
+    related_targets = _LazyDataset('video')
+    size_df = _LazyDataset('size')
+    user_df = _LazyDataset('user')
+    
+    def __init__(self, data_directory: str, query_cache_entries: int = QUERY_CACHE_ENTRIES, profile: bool = None):
         self.data_directory = data_directory
+        self.profiler = _environment_profiler() if profile is None else StageProfiler(profile)
+        self._pending_loads = {}
+        self._data_version = 0
+        self.query_cache = QueryCache(query_cache_entries) if query_cache_entries else None
         
         self.video_df = None
         self.size_df = None
         self.user_df = None
-        self.related_df = None
+        self._related_df = None
+        self._node_graph = None
+        self._range_index = None
+        self._top_k = None
+        self._uploader_cube = None
+        self._friend_graph = None
+        self._uploader_clusters = None
+        self._centrality = None
+        self._layout_cache = {}
+        
+        self.node_ids = None
+        self.video_nodes = None
+        self.related_offsets = None
+        self.related_targets = None
+        self.node_uploaders = None
+        self.uploader_names = None
+        
+        self.size_folder = None
+        self._size_lookup = None
+        self.load_timings = {}
+        
+        self.ingested_files = {}
+        self._video_interner = None
+        self._node_has_row = None
+        
+        self.streaming = False
+        self.stream_paths = None
+        self.stream_lengths = None
+        self.stream_skip_rows = None
+        self.chunk_size = STREAM_CHUNK_ROWS
+        self._spill_cleanup = None
+        
+        self.snapshot_series = None
+        
+    @_profiled()
+    def load_data(self, video_folder: str, size_folder: str = None, user_folder: str = None,
+                  workers: int = 1, use_cache: bool = True, streaming: bool = False,
+                  chunk_size: int = STREAM_CHUNK_ROWS, spill_directory: str = None,
+                  compact: bool = False, lazy: bool = False):
+        for dataset, folder in [('video', video_folder), ('size', size_folder), ('user', user_folder)]:
+            if folder:
+                self._pending_loads.pop(dataset, None)
+        
+        if lazy:
+            options = {'video_folder': None, 'use_cache': use_cache, 'compact': compact}
+            if video_folder:
+                self._pending_loads['video'] = dict(options, video_folder=video_folder, workers=workers,
+                                                    streaming=streaming, chunk_size=chunk_size,
+                                                    spill_directory=spill_directory)
+            if size_folder:
+                self.size_folder = size_folder
+                self._pending_loads['size'] = dict(options, size_folder=size_folder)
+            if user_folder:
+                self._pending_loads['user'] = dict(options, user_folder=user_folder)
+            print("Data will be loaded when first needed.")
+            return
         
-    def load_data(self, video_folder: str, size_folder: str = None, user_folder: str = None):
         print("Loading data from folders...")
         
         if video_folder:
             video_path = os.path.join(self.data_directory, video_folder)
             if os.path.exists(video_path):
-                self.video_df = self._extract_video_data(video_path)
-                if self.video_df is not None:
-                    self.related_df = self._extract_related_videos()
+                self._reset_derived_state()
+                self.node_uploaders = None
+                self.uploader_names = None
+                self.ingested_files = {}
+                self._video_interner = None
+                self._node_has_row = None
+                self._uploader_cube = None
+                if self._spill_cleanup is not None:
+                    self._spill_cleanup()
+                    self._spill_cleanup = None
+                self.streaming = streaming
+                if streaming:
+                    self.video_df = None
+                    self._load_streaming(video_path, chunk_size, spill_directory)
+                else:
+                    scan = {}
+                    self.video_df = self._extract_video_data(video_path, workers, use_cache, scan)
+                    if self.video_df is not None:
+                        self._uploader_cube = UploaderCube(self.video_df)
+                        self._load_related_graph(video_path, use_cache, scan.get('sources'))
+                        self.ingested_files = scan['lengths']
+                        self.profiler.count(rows=len(self.video_df), edges=len(self.related_targets))
             else:
                 print(f"Error: Video folder {video_path} not found")
                 
         if size_folder:
+            self.size_folder = size_folder
             size_path = os.path.join(self.data_directory, size_folder)
             if os.path.exists(size_path):
-                self.size_df = self._extract_size_data(size_path)
+                self.size_df = self._extract_size_data(size_path, use_cache)
+                self._size_lookup = None
             else:
                 print(f"Error: Size folder {size_path} not found")
+        
+        # Only a call that loaded video or size data can change the size column; re-attaching would drop the caches.
+        if (video_folder or size_folder) and not self._pending_loads.keys() & {'video', 'size'} \
+                and self.video_df is not None and self.size_df is not None:
+            self._attach_size_column()
                 
         if user_folder:
             user_path = os.path.join(self.data_directory, user_folder)
             if os.path.exists(user_path):
-                self.user_df = self._extract_user_data(user_path)
+                self.user_df = self._extract_user_data(user_path, use_cache)
+                self._friend_graph = None
             else:
                 print(f"Error: User folder {user_path} not found")
         
+        if compact:
+            self._compact_frames(video=bool(video_folder), user=bool(user_folder))
+        
         print("Data loading completed.")
     
-    def _extract_video_data(self, folder_path: str):
-        print(f"Extracting video data from {folder_path}...")
+    def _load_pending(self, dataset: str):
+        """Run the load deferred by load_data(lazy=True) for one of 'video', 'size' or 'user'."""
+        self.load_data(**self._pending_loads.pop(dataset))
+    
+    @_profiled()
+    def append_data(self, path: str, workers: int = 1):
+        """Ingest new or grown depth files under path, skipping already loaded videos and extending the indexes in place."""
+        if self.video_df is None or self.streaming:
+            print("Error: Video data must be loaded in memory to append")
+            return 0
+        if 'related_ids' not in self.video_df.columns:
+            print("Error: Cannot append to compacted video data; reload without compact=True")
+            return 0
+        
+        full_path = os.path.join(self.data_directory, path)
+        if os.path.isdir(full_path):
+            data_paths = self._video_data_paths(full_path) or []
+        elif os.path.exists(full_path):
+            data_paths = [full_path]
+        else:
+            print(f"Error: {full_path} not found")
+            return 0
+        
+        tasks, lengths = [], {}
+        for file_path in data_paths:
+            try:
+                lengths[file_path] = _complete_length(file_path)
+                start = self.ingested_files.get(file_path, 0)
+                if lengths[file_path] > start:
+                    tasks.append((file_path, _video_file_chunks(file_path, start=start, file_size=lengths[file_path])))
+            except Exception as e:
+                print(f"Error reading {file_path}: {e}")
+        
+        if not tasks:
+            print(f"No new video data in {full_path}")
+            return 0
+        
+        print(f"Appending new data from {len(tasks)} file(s)...")
+        frames = self._parse_video_files(tasks, workers)
+        self.ingested_files.update(lengths)
+        if not frames:
+            return 0
+        new_df = pd.concat(frames, ignore_index=True)
+        
+        if self._video_interner is None:
+            self._video_interner = VideoIdInterner(self.node_ids)
+            self._node_has_row = np.zeros(len(self.node_ids), dtype=bool)
+            self._node_has_row[self.video_nodes] = True
+        interner = self._video_interner
+        
+        video_ids = new_df['video_id'].to_numpy(dtype=object)
+        codes = interner.lookup(video_ids)
+        loaded = np.zeros(len(codes), dtype=bool)
+        loaded[codes >= 0] = self._node_has_row[codes[codes >= 0]]
+        fresh = ~loaded & ~pd.Index(video_ids).duplicated(keep='first')
+        new_df = new_df[fresh].reset_index(drop=True)
+        
+        duplicates = int(len(fresh) - fresh.sum())
+        if len(new_df) == 0:
+            print(f"No new videos appended ({duplicates} duplicates skipped)")
+            return 0
+        
+        node_count = len(self.node_ids)
+        graph = self._build_related_graph(new_df, interner)
+        new_nodes = interner.ids_since(node_count)
+        
+        self.node_ids = np.concatenate([self.node_ids, new_nodes])
+        self._node_has_row = np.concatenate([self._node_has_row, np.zeros(len(new_nodes), dtype=bool)])
+        self._node_has_row[graph['video_nodes']] = True
+        self.video_nodes = np.concatenate([self.video_nodes, graph['video_nodes']])
+        self.related_offsets = np.concatenate([self.related_offsets[:-1], graph['related_offsets'] + self.related_offsets[-1]])
+        self.related_targets = np.concatenate([self.related_targets, graph['related_targets']])
+        
+        if 'size' in self.video_df.columns:
+            sizes = self._sizes_for(new_df['video_id'])
+            new_df['size'] = sizes if sizes is not None else np.nan
+        
+        if self._centrality is not None:
+            self.video_df.drop(columns=CENTRALITY_COLUMNS, inplace=True, errors='ignore')
+            self._centrality = None
+        
+        start = len(self.video_df)
+        self.video_df = pd.concat([self.video_df, new_df[self.video_df.columns]], ignore_index=True)
+        
+        if self._top_k is not None:
+            self._top_k.extend(self.video_df, start)
+        if self._range_index is not None:
+            self._range_index.extend(self.video_df, start)
+        if self._uploader_cube is not None:
+            self._uploader_cube.add(new_df)
+        self._related_df = None
+        self._node_graph = None
+        self._uploader_clusters = None
+        
+        self.profiler.count(rows=len(new_df), edges=len(graph['related_targets']), duplicates=duplicates)
+        print(f"Appended {len(new_df)} videos and {len(graph['related_targets'])} related-video edges "
+              f"({duplicates} duplicates skipped)")
+        return len(new_df)
+    
+    @_profiled()
+    def load_snapshots(self, video_folders: List[str], workers: int = 1, use_cache: bool = True):
+        """Load several video folders (crawl snapshots) and align them on video_id for delta and growth queries."""
+        labels, frames = [], []
+        for folder in video_folders:
+            folder_path = os.path.join(self.data_directory, folder)
+            if not os.path.exists(folder_path):
+                print(f"Error: Video folder {folder_path} not found")
+                continue
+            
+            video_df = self._extract_video_data(folder_path, workers, use_cache)
+            if video_df is not None:
+                labels.append(folder)
+                frames.append(video_df[['video_id'] + SNAPSHOT_COLUMNS])
         
+        if len(frames) < 2:
+            print("Error: At least two video snapshots are needed")
+            return None
+        
+        self.snapshot_series = SnapshotSeries(labels, frames)
+        self.profiler.count(snapshots=len(labels), rows=len(self.snapshot_series.video_ids))
+        print(f"Aligned {len(labels)} snapshots over {len(self.snapshot_series.video_ids)} videos "
+              f"(changing columns: {', '.join(self.snapshot_series.series) or 'none'})")
+        
+        return self.snapshot_series
+    
+    @_profiled()
+    def _load_streaming(self, folder_path: str, chunk_size: int, spill_directory: str = None):
+        """Index the video folder chunk by chunk, spilling the related-video edges to disk."""
+        print(f"Indexing video data from {folder_path} in chunks of {chunk_size} rows...")
+        
+        data_paths = self._video_data_paths(folder_path)
+        if not data_paths:
+            print(f"No data files found in {folder_path}")
+            return
+        
+        self.stream_paths = data_paths
+        self.chunk_size = chunk_size
+        
+        spill_path = spill_directory
+        if spill_path is None:
+            spill_path = tempfile.mkdtemp(prefix='youtube_edges_')
+            self._spill_cleanup = weakref.finalize(self, shutil.rmtree, spill_path, True)
+        os.makedirs(spill_path, exist_ok=True)
+        
+        # Same rules as the in-memory load: stop each file at its last newline and keep the first row of a video_id.
+        self.stream_lengths = {path: _complete_length(path) for path in data_paths}
+        _report_unterminated_lines(self.stream_lengths)
+        
+        interner = VideoIdInterner()
+        has_row = np.zeros(0, dtype=bool)
+        cube = UploaderCube()
+        skipped = []
+        total_rows = 0
+        with open(os.path.join(spill_path, 'video_nodes.i4'), 'wb') as nodes_file, \
+                open(os.path.join(spill_path, 'related_counts.i4'), 'wb') as counts_file, \
+                open(os.path.join(spill_path, 'related_targets.i4'), 'wb') as targets_file:
+            for frame in _iter_video_frames(data_paths, chunk_size, self.stream_lengths):
+                video_ids = frame['video_id'].to_numpy(dtype=object)
+                codes = interner.lookup(video_ids)
+                loaded = np.zeros(len(codes), dtype=bool)
+                loaded[codes >= 0] = has_row[codes[codes >= 0]]
+                fresh = ~loaded & ~pd.Index(video_ids).duplicated(keep='first')
+                if not fresh.all():
+                    skipped.append(frame.index.to_numpy()[~fresh])
+                    frame = frame[fresh]
+                    if len(frame) == 0:
+                        continue
+                
+                graph = self._build_related_graph(frame, interner)
+                has_row = np.concatenate([has_row, np.zeros(interner.size - len(has_row), dtype=bool)])
+                has_row[graph['video_nodes']] = True
+                graph['video_nodes'].tofile(nodes_file)
+                np.diff(graph['related_offsets']).astype(np.int32).tofile(counts_file)
+                graph['related_targets'].tofile(targets_file)
+                cube.add(frame)
+                total_rows += len(frame)
+        
+        self.stream_skip_rows = np.concatenate(skipped) if skipped else np.zeros(0, dtype=np.int64)
+        if len(self.stream_skip_rows):
+            print(f"Skipped {len(self.stream_skip_rows)} repeated video records")
+        
+        counts = _map_spill_file(os.path.join(spill_path, 'related_counts.i4'))
+        offsets = np.lib.format.open_memmap(os.path.join(spill_path, 'related_offsets.npy'), mode='w+',
+                                            dtype=np.int32, shape=(total_rows + 1,))
+        offsets[0] = 0
+        if total_rows:
+            np.cumsum(counts, out=offsets[1:])
+        offsets.flush()
+        
+        # The interner's hash of every distinct ID is only needed while indexing; afterwards the ID table is
+        # spilled as well and decoded on demand, so no per-ID Python strings outlive the load.
+        node_ids_path = os.path.join(spill_path, 'node_ids.npy')
+        np.save(node_ids_path, np.char.encode(np.asarray(interner.ids, dtype=str), 'utf-8'))
+        del interner
+        
+        self._uploader_cube = cube
+        self.node_ids = EncodedVideoIds(np.load(node_ids_path, mmap_mode='r'))
+        self.video_nodes = _map_spill_file(os.path.join(spill_path, 'video_nodes.i4'))
+        self.related_offsets = np.load(os.path.join(spill_path, 'related_offsets.npy'), mmap_mode='r')
+        self.related_targets = _map_spill_file(os.path.join(spill_path, 'related_targets.i4'))
+        
+        self.profiler.count(rows=total_rows, edges=len(self.related_targets))
+        print(f"Indexed {total_rows} videos and {len(self.related_targets)} related-video edges, spilled to {spill_path}")
+    
+    def _iter_video_chunks(self):
+        return _iter_video_frames(self.stream_paths, self.chunk_size, self.stream_lengths, self.stream_skip_rows)
+    
+    def _stream_top(self, key, k: int):
+        """Merge each chunk's top rows into a running top-k frame that keeps global row order for ties."""
+        top = None
+        for frame in self._iter_video_chunks():
+            if top is not None:
+                frame = pd.concat([top.sort_index(), frame])
+            
+            positions, ranks = TopKEngine(frame).top_positions(key, k)
+            top = frame.iloc[positions]
+        
+        if top is None:
+            return None, None
+        return top, ranks
+    
+    def _stream_select(self, column: str, min_value=None, max_value=None, category: str = None):
+        """Filter every chunk on [min_value, max_value] of column (and category) and concatenate the matches."""
+        matches = []
+        for frame in self._iter_video_chunks():
+            if column == 'size' or self.size_df is not None:
+                frame['size'] = self._sizes_for(frame['video_id'])
+            
+            mask = np.ones(len(frame), dtype=bool)
+            if category is not None:
+                mask &= (frame['category'] == category).to_numpy()
+            if min_value is not None:
+                mask &= (frame[column] >= min_value).to_numpy()
+            if max_value is not None:
+                mask &= (frame[column] <= max_value).to_numpy()
+            
+            matches.append(frame[mask])
+        
+        if not matches:
+            return None
+        return pd.concat(matches)
+    
+    def _video_data_paths(self, folder_path: str):
         try:
             data_files = [f for f in os.listdir(folder_path) if f.endswith('.txt') and f[0].isdigit()]
         except Exception as e:
             print(f"Error accessing directory {folder_path}: {e}")
             return None
         
-        if not data_files:
+        return [os.path.join(folder_path, data_file) for data_file in sorted(data_files)]
+    
+    @_profiled()
+    def _extract_video_data(self, folder_path: str, workers: int = 1, use_cache: bool = True, scan: Dict = None):
+        """Parse depth files up to their last newline, keeping each video_id's first row; scan gets lengths and sources."""
+        print(f"Extracting video data from {folder_path}...")
+        
+        data_paths = self._video_data_paths(folder_path)
+        if data_paths is None:
+            return None
+        
+        if not data_paths:
             print(f"No data files found in {folder_path}")
             return None
         
-        all_data = []
-        for data_file in sorted(data_files):
-            file_path = os.path.join(folder_path, data_file)
+        sources = self._snapshot_sources(data_paths)
+        complete = {}
+        for file_path in data_paths:
             try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    for line in f:
-                        line = line.strip()
-                        parts = line.split('\t')
-                        
-                        if len(parts) >= 10:
-                            video_id = parts[0]
-                            uploader = parts[1]
-                            age = int(parts[2]) if parts[2].isdigit() else 0
-                            category = parts[3]
-                            length = int(parts[4]) if parts[4].isdigit() else 0
-                            views = int(parts[5]) if parts[5].isdigit() else 0
-                            rate = float(parts[6]) if parts[6].replace('.', '', 1).isdigit() else 0.0
-                            ratings = int(parts[7]) if parts[7].isdigit() else 0
-                            comments = int(parts[8]) if parts[8].isdigit() else 0
-                            related_ids = parts[9]
-                            
-                            all_data.append({
-                                'video_id': video_id,
-                                'uploader': uploader,
-                                'age': age,
-                                'category': category,
-                                'length': length,
-                                'views': views,
-                                'rate': rate,
-                                'ratings': ratings,
-                                'comments': comments,
-                                'related_ids': related_ids
-                            })
-                            
-                print(f"Processed {file_path} - Added {len(all_data)} records")
+                complete[file_path] = _complete_length(file_path)
             except Exception as e:
                 print(f"Error reading {file_path}: {e}")
-                continue
+        _report_unterminated_lines(complete)
+        if scan is not None:
+            scan.update(lengths=complete, sources=sources)
+        
+        if use_cache:
+            cached = self._read_snapshot(folder_path, 'video', data_paths, sources)
+            if cached is not None:
+                video_df = pd.DataFrame(cached)
+                print(f"Loaded {len(video_df)} video records from snapshot")
+                return video_df
+        
+        tasks = []
+        for file_path, file_size in complete.items():
+            try:
+                tasks.append((file_path, _video_file_chunks(file_path, file_size=file_size)))
+            except Exception as e:
+                print(f"Error reading {file_path}: {e}")
+        
+        frames = self._parse_video_files(tasks, workers)
+        total_records = sum(len(frame) for frame in frames)
         
-        if not all_data:
+        if total_records == 0:
             print("No data could be read from the files")
             return None
         
         try:
-            video_df = pd.DataFrame(all_data)
-            video_df['related_ids_list'] = video_df['related_ids'].apply(lambda x: x.split(',') if x else [])
+            video_df = pd.concat(frames, ignore_index=True)
+            duplicated = video_df['video_id'].duplicated(keep='first').to_numpy()
+            if duplicated.any():
+                video_df = video_df[~duplicated].reset_index(drop=True)
+                print(f"Skipped {int(duplicated.sum())} repeated video records")
+            if use_cache:
+                self._write_snapshot(folder_path, 'video', data_paths, video_df, sources)
             print(f"Successfully loaded {len(video_df)} video records")
             return video_df
         except Exception as e:
             print(f"Error creating DataFrame: {e}")
             return None
     
-    def _extract_size_data(self, folder_path: str):
+    @_profiled()
+    def _parse_video_files(self, tasks, workers: int = 1):
+        """Parse (file_path, byte ranges) tasks, in a process pool when workers > 1, into a list of frames."""
+        pool = None
+        if workers > 1:
+            print(f"Parsing {sum(len(chunks) for _, chunks in tasks)} chunks with {workers} workers...")
+            pool = ProcessPoolExecutor(max_workers=workers)
+        
+        try:
+            if pool is not None:
+                tasks = [(file_path, [pool.submit(_parse_video_chunk, file_path, start, end) for start, end in chunks])
+                         for file_path, chunks in tasks]
+            
+            frames = []
+            total_records = 0
+            for file_path, chunks in tasks:
+                try:
+                    if pool is not None:
+                        chunk_results = [future.result() for future in chunks]
+                    else:
+                        chunk_results = [_parse_video_chunk(file_path, start, end) for start, end in chunks]
+                    
+                    file_frames = [frame for frame, _ in chunk_results if len(frame)]
+                    elapsed = sum(seconds for _, seconds in chunk_results)
+                except Exception as e:
+                    print(f"Error reading {file_path}: {e}")
+                    continue
+                
+                frames.extend(file_frames)
+                total_records += sum(len(frame) for frame in file_frames)
+                self.load_timings[file_path] = elapsed
+                print(f"Processed {file_path} - Added {total_records} records ({elapsed:.2f}s)")
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        
+        self.profiler.count(files=len(tasks), rows=total_records)
+        return frames
+    
+    @_profiled()
+    def _extract_size_data(self, folder_path: str, use_cache: bool = True):
         print(f"Extracting size data from {folder_path}...")
         
         size_file_path = os.path.join(folder_path, "size.txt")
@@ -118,7 +1481,7 @@ class YouTubeDataAnalyzer:
             print(f"Size data file not found at {size_file_path}")
             try:
                 for file in os.listdir(folder_path):
-                    if file.endswith('.txt') and ('size' in file.lower()):
+                    if file.endswith('.txt') and ('size' in file.lower() or 'length' in file.lower()):
                         size_file_path = os.path.join(folder_path, file)
                         print(f"Using alternative size file: {size_file_path}")
                         break
@@ -128,6 +1491,13 @@ class YouTubeDataAnalyzer:
                 print(f"Error searching for size files: {e}")
                 return None
         
+        if use_cache:
+            cached = self._read_snapshot(folder_path, 'size', [size_file_path])
+            if cached is not None:
+                size_df = pd.DataFrame(cached)
+                print(f"Loaded {len(size_df)} size records from snapshot")
+                return size_df
+        
         try:
             size_data = []
             
@@ -152,414 +1522,1227 @@ class YouTubeDataAnalyzer:
             size_df = pd.DataFrame(size_data)
             print(f"Successfully loaded {len(size_df)} size records")
             
+            if use_cache:
+                self._write_snapshot(folder_path, 'size', [size_file_path], size_df)
+            
             return size_df
             
         except Exception as e:
             print(f"Error reading size data: {e}")
             return None
     
-    def _extract_user_data(self, folder_path: str):
-        print(f"Extracting user data from {folder_path}...")
+    @_profiled()
+    def _extract_user_data(self, folder_path: str, use_cache: bool = True):
+        print(f"Extracting user data from {folder_path}...")
+        
+        user_file_path = os.path.join(folder_path, "user.txt")
+        
+        if not os.path.exists(user_file_path):
+            print(f"User data file not found at {user_file_path}")
+            try:
+                for file in os.listdir(folder_path):
+                    if file.endswith('.txt') and ('user' in file.lower()) and ('id' not in file.lower()):
+                        user_file_path = os.path.join(folder_path, file)
+                        print(f"Using alternative user file: {user_file_path}")
+                        break
+                else:
+                    return None
+            except Exception as e:
+                print(f"Error searching for user files: {e}")
+                return None
+        
+        if use_cache:
+            cached = self._read_snapshot(folder_path, 'user', [user_file_path])
+            if cached is not None:
+                user_df = pd.DataFrame(cached)
+                user_df['friends_list'] = user_df['friends'].apply(lambda x: x.split(',') if x else [])
+                print(f"Loaded {len(user_df)} user records from snapshot")
+                return user_df
+        
+        try:
+            user_data = []
+            
+            with open(user_file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                for line in f:
+                    line = line.strip()
+                    parts = line.split('\t')
+                    
+                    if len(parts) >= 3:
+                        username = parts[0]
+                        uploads = int(parts[1]) if parts[1].isdigit() else 0
+                        friends = parts[2]
+                        
+                        user_data.append({
+                            'username': username,
+                            'uploads': uploads,
+                            'friends': friends
+                        })
+            
+            if not user_data:
+                print(f"No data in {user_file_path}")
+                return None
+            
+            user_df = pd.DataFrame(user_data)
+            if use_cache:
+                self._write_snapshot(folder_path, 'user', [user_file_path], user_df)
+            user_df['friends_list'] = user_df['friends'].apply(lambda x: x.split(',') if x else [])
+            print(f"Successfully loaded {len(user_df)} user records")
+            
+            return user_df
+            
+        except Exception as e:
+            print(f"Error reading user data: {e}")
+            return None
+    
+    def _snapshot_sources(self, source_paths: List[str]):
+        sources = []
+        for path in source_paths:
+            stat = os.stat(path)
+            sources.append([os.path.basename(path), stat.st_mtime_ns, stat.st_size])
+        return sources
+    
+    def _read_snapshot(self, folder_path: str, name: str, source_paths: List[str], sources=None):
+        snapshot_path = os.path.join(folder_path, SNAPSHOT_DIRNAME, name)
+        manifest_path = os.path.join(snapshot_path, 'manifest.json')
+        
+        if not os.path.exists(manifest_path):
+            return None
+        
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            
+            if (manifest.get('version') != SNAPSHOT_VERSION or
+                    manifest.get('sources') != (sources if sources is not None else self._snapshot_sources(source_paths))):
+                print(f"Snapshot {snapshot_path} is out of date, rebuilding...")
+                return None
+            
+            columns = {}
+            for column, kind, length in manifest['columns']:
+                if kind == 'str':
+                    with open(os.path.join(snapshot_path, f"{column}.txt"), 'r', encoding='utf-8') as f:
+                        values = f.read().split('\n') if length else []
+                    columns[column] = np.array(values, dtype=object)
+                else:
+                    columns[column] = np.load(os.path.join(snapshot_path, f"{column}.npy"))
+            
+            return columns
+        except Exception as e:
+            print(f"Error reading snapshot {snapshot_path}: {e}")
+            return None
+    
+    def _write_snapshot(self, folder_path: str, name: str, source_paths: List[str], columns, sources=None):
+        snapshot_path = os.path.join(folder_path, SNAPSHOT_DIRNAME, name)
+        staging_path = snapshot_path + '.tmp'
+        
+        try:
+            shutil.rmtree(staging_path, ignore_errors=True)
+            os.makedirs(staging_path)
+            
+            written = []
+            for column in columns:
+                values = np.asarray(columns[column])
+                if values.dtype.kind in 'biuf':
+                    np.save(os.path.join(staging_path, f"{column}.npy"), values)
+                    written.append([column, 'npy', len(values)])
+                else:
+                    with open(os.path.join(staging_path, f"{column}.txt"), 'w', encoding='utf-8') as f:
+                        f.write('\n'.join(values))
+                    written.append([column, 'str', len(values)])
+            
+            manifest = {
+                'version': SNAPSHOT_VERSION,
+                'sources': sources if sources is not None else self._snapshot_sources(source_paths),
+                'columns': written
+            }
+            with open(os.path.join(staging_path, 'manifest.json'), 'w', encoding='utf-8') as f:
+                json.dump(manifest, f)
+            
+            shutil.rmtree(snapshot_path, ignore_errors=True)
+            os.replace(staging_path, snapshot_path)
+            print(f"Saved snapshot to {snapshot_path}")
+        except Exception as e:
+            print(f"Could not write snapshot {snapshot_path}: {e}")
+            shutil.rmtree(staging_path, ignore_errors=True)
+    
+    @_profiled()
+    def _load_related_graph(self, folder_path: str, use_cache: bool = True, sources=None):
+        data_paths = self._video_data_paths(folder_path) if use_cache else None
+        
+        graph = None
+        if data_paths:
+            graph = self._read_snapshot(folder_path, 'graph', data_paths, sources)
+        
+        if graph is None:
+            graph = self._build_related_graph(self.video_df)
+            if data_paths:
+                self._write_snapshot(folder_path, 'graph', data_paths, graph, sources)
+        
+        self.node_ids = graph['node_ids']
+        self.video_nodes = graph['video_nodes']
+        self.related_offsets = graph['related_offsets']
+        self.related_targets = graph['related_targets']
+        
+        self.profiler.count(nodes=len(self.node_ids), edges=len(self.related_targets))
+        print(f"Indexed {len(self.related_targets)} related-video edges over {len(self.node_ids)} videos")
+    
+    def _build_related_graph(self, video_df, interner: VideoIdInterner = None):
+        """Intern video IDs and store related videos as CSR offsets/targets per video_df row."""
+        if interner is None:
+            print("Creating related videos index...")
+        
+        related = video_df['related_ids'].to_numpy(dtype=object)
+        tokens = np.array(','.join(related).split(','), dtype=object)
+        token_rows = np.repeat(np.arange(len(related)), video_df['related_ids'].str.count(',').to_numpy() + 1)
+        
+        keep = tokens != ''
+        tokens = tokens[keep]
+        counts = np.bincount(token_rows[keep], minlength=len(related))
+        
+        video_ids = video_df['video_id'].to_numpy(dtype=object)
+        if interner is not None:
+            codes = interner.intern(np.concatenate([video_ids, tokens]))
+            node_ids = None
+        else:
+            codes, node_ids = pd.factorize(np.concatenate([video_ids, tokens]))
+        
+        offsets = np.zeros(len(related) + 1, dtype=np.int32)
+        np.cumsum(counts, out=offsets[1:])
+        
+        return {
+            'node_ids': np.asarray(node_ids, dtype=object) if node_ids is not None else None,
+            'video_nodes': codes[:len(video_ids)].astype(np.int32),
+            'related_offsets': offsets,
+            'related_targets': codes[len(video_ids):].astype(np.int32)
+        }
+    
+    @_profiled()
+    def _compact_frames(self, video: bool = True, user: bool = True):
+        """Switch video_df and/or user_df to categorical, narrow and interned dtypes and drop raw strings."""
+        print("Compacting loaded data...")
+        
+        if video and self.video_df is not None:
+            video_df = self.video_df.drop(columns=['related_ids'], errors='ignore')
+            
+            if self.video_nodes is not None and len(self.video_nodes) == len(video_df):
+                video_df['video_id'] = pd.Categorical.from_codes(self.video_nodes, categories=pd.Index(self.node_ids))
+            
+            for column in ['uploader', 'category']:
+                codes, uniques = pd.factorize(video_df[column].to_numpy(dtype=object))
+                video_df[column] = pd.Categorical.from_codes(codes, categories=pd.Index(uniques))
+            
+            for column in VIDEO_NARROW_COLUMNS:
+                video_df[column] = pd.to_numeric(video_df[column], downcast='integer')
+            video_df['rate'] = video_df['rate'].astype(np.float32)
+            
+            self.video_df = video_df
+            self._reset_derived_state()
+        
+        if user and self.user_df is not None:
+            if 'friends' in self.user_df.columns:
+                self.friend_graph
+            user_df = self.user_df.drop(columns=['friends', 'friends_list'], errors='ignore')
+            user_df['uploads'] = pd.to_numeric(user_df['uploads'], downcast='integer')
+            self.user_df = user_df
+    
+    def memory_report(self):
+        """Return the resident size of every loaded column and graph array, largest first."""
+        rows = []
+        for frame_name in ['video_df', 'size_df', 'user_df']:
+            frame = getattr(self, frame_name)
+            if frame is None:
+                continue
+            for column, size in frame.memory_usage(index=False, deep=True).items():
+                dtype = str(frame[column].dtype)
+                if frame_name == 'video_df' and column == 'video_id' and dtype == 'category':
+                    size = frame[column].cat.codes.nbytes
+                    dtype = 'category (shares node_ids)'
+                rows.append({'frame': frame_name, 'column': column, 'dtype': dtype, 'bytes': int(size)})
+        
+        for array_name in ['node_ids', 'video_nodes', 'related_offsets', 'related_targets']:
+            array = getattr(self, array_name)
+            if array is None:
+                continue
+            size = pd.Series(array).memory_usage(index=False, deep=True) if array.dtype == object else array.nbytes
+            rows.append({'frame': 'graph', 'column': array_name, 'dtype': str(array.dtype), 'bytes': int(size)})
+        
+        if self._uploader_cube is not None:
+            for array_name in ['cell_keys', 'counts', 'sums']:
+                array = getattr(self._uploader_cube, array_name)
+                rows.append({'frame': 'uploader_cube', 'column': array_name, 'dtype': str(array.dtype),
+                             'bytes': int(array.nbytes)})
+        
+        report = pd.DataFrame(rows, columns=['frame', 'column', 'dtype', 'bytes'])
+        report = report.sort_values(by='bytes', ascending=False, kind='stable').reset_index(drop=True)
+        print(f"Total resident data: {report['bytes'].sum() / 1024 ** 2:.1f} MB")
+        
+        return report
+    
+    def _reset_derived_state(self):
+        self._data_version += 1
+        self._related_df = None
+        self._uploader_clusters = None
+        self._centrality = None
+        self._node_graph = None
+        self._range_index = None
+        self._top_k = None
+    
+    @property
+    def related_df(self):
+        if self._related_df is None and self.related_targets is not None:
+            self._related_df = self._extract_related_videos()
+        return self._related_df
+    
+    @_profiled()
+    def _extract_related_videos(self):
+        if self.related_targets is None:
+            return None
+        
+        print("Creating related videos mapping...")
+        
+        sources = np.repeat(self.video_nodes, np.diff(self.related_offsets))
+        
+        related_df = pd.DataFrame({
+            'source_id': self.node_ids[sources],
+            'target_id': self.node_ids[self.related_targets]
+        })
+        print(f"Created {len(related_df)} video relationship records")
+        
+        return related_df
+    
+    @_cached_query
+    def get_top_k_categories(self, k: int = 10):
+        if self.streaming:
+            print(f"Finding top {k} categories with the most videos (streaming)...")
+            counts = None
+            for frame in self._iter_video_chunks():
+                chunk_counts = frame['category'].value_counts(sort=False)
+                counts = chunk_counts if counts is None else pd.concat([counts, chunk_counts]).groupby(level=0, sort=False).sum()
+            
+            if counts is None:
+                return None
+            top_categories = counts.sort_values(ascending=False, kind='stable').head(k).reset_index()
+            top_categories.columns = ['category', 'count']
+            return top_categories
+        
+        if self.video_df is None:
+            print("Error: Video data not loaded")
+            return None
+        
+        print(f"Finding top {k} categories with the most videos...")
+        
+        top_categories = self.top_k.top_categories(k).reset_index()
+        top_categories.columns = ['category', 'count']
+        
+        return top_categories
+    
+    @_cached_query
+    def get_top_k_rated_videos(self, k: int = 10, min_ratings: int = 10):
+        if self.streaming:
+            print(f"Finding top {k} rated videos (streaming)...")
+            top, _ = self._stream_top(('rated', min_ratings), k)
+            return top[['video_id', 'uploader', 'category', 'rate', 'ratings', 'views']] if top is not None else None
+        
+        if self.video_df is None:
+            print("Error: Video data not loaded")
+            return None
+        
+        print(f"Finding top {k} rated videos...")
+        
+        positions, _ = self.top_k.top_positions(('rated', min_ratings), k)
+        top_rated = self.video_df.iloc[positions][['video_id', 'uploader', 'category', 'rate', 'ratings', 'views']]
+        
+        return top_rated
+    
+    @_cached_query
+    def get_top_k_popular_videos(self, k: int = 10):
+        if self.streaming:
+            print(f"Finding top {k} most popular videos (streaming)...")
+            top, _ = self._stream_top(('popular', 'views'), k)
+            return top[['video_id', 'uploader', 'category', 'views', 'rate', 'comments']] if top is not None else None
+        
+        if self.video_df is None:
+            print("Error: Video data not loaded")
+            return None
+        
+        print(f"Finding top {k} most popular videos...")
+        
+        positions, _ = self.top_k.top_positions(('popular', 'views'), k)
+        top_popular = self.video_df.iloc[positions][['video_id', 'uploader', 'category', 'views', 'rate', 'comments']]
+        
+        return top_popular
+    
+    @_cached_query
+    def get_top_k_per_category(self, k: int = 10, by: str = 'views'):
+        """Top k videos of every category by a numeric column, computed in one sort and cached."""
+        if self.streaming:
+            top, ranks = self._stream_top(('per_category', by), k)
+            if top is None:
+                return None
+            result = top.assign(rank=ranks + 1)
+            return result[['rank', 'video_id', 'uploader', 'category', by]]
+        
+        if self.video_df is None:
+            print("Error: Video data not loaded")
+            return None
+        
+        print(f"Finding top {k} videos per category by {by}...")
+        
+        positions, ranks = self.top_k.top_positions(('per_category', by), k)
+        result = self.video_df.iloc[positions].assign(rank=ranks + 1)
+        result = result[['rank', 'video_id', 'uploader', 'category', by]]
+        
+        return result
+    
+    @property
+    def uploader_cube(self):
+        video_df = self.video_df
+        if self._uploader_cube is None and video_df is not None:
+            self._uploader_cube = UploaderCube(video_df)
+        return self._uploader_cube
+    
+    @_cached_query
+    def get_top_k_uploaders(self, k: int = 10, by: str = 'views', stat: str = 'sum', category: str = None,
+                            min_videos: int = 1):
+        """Top k uploaders by video count or the sum/mean of a measure, overall or within one category."""
+        cube = self.uploader_cube
+        if cube is None:
+            print("Error: Video data not loaded")
+            return None
+        if by != 'videos' and (by not in UPLOADER_MEASURES or stat not in ('sum', 'mean')):
+            print(f"Error: Cannot rank uploaders by {stat} of '{by}'")
+            return None
+        
+        print(f"Finding top {k} uploaders by {by if by == 'videos' else f'{stat} of {by}'}...")
+        
+        codes, counts, sums = cube.uploader_totals(category)
+        if by == 'videos':
+            scores = counts
+        else:
+            scores = sums[:, UPLOADER_MEASURES.index(by)]
+            if stat == 'mean':
+                scores = scores / counts
+        
+        candidates = np.flatnonzero(counts >= min_videos)
+        if len(candidates) > k:
+            threshold = np.partition(scores[candidates], len(candidates) - k)[len(candidates) - k]
+            candidates = candidates[scores[candidates] >= threshold]
+        names = cube.uploaders.ids[codes[candidates]]
+        top = np.lexsort((names.astype(str), -scores[candidates]))[:k]
+        
+        return cube.frame(counts[candidates[top]], sums[candidates[top]], uploader=names[top])
+    
+    @_cached_query
+    def get_uploader_categories(self, uploader: str):
+        """Drill down into one uploader: video count and sum/mean of every measure per category."""
+        cube = self.uploader_cube
+        if cube is None:
+            print("Error: Video data not loaded")
+            return None
+        
+        print(f"Breaking down videos of uploader '{uploader}' by category...")
+        
+        codes, counts, sums = cube.uploader_cells(uploader)
+        categories = cube.categories.ids[codes]
+        order = np.lexsort((categories.astype(str), -counts))
+        
+        return cube.frame(counts[order], sums[order], uploader=uploader, category=categories[order])
+    
+    def get_snapshot_deltas(self, column: str = 'views', start=0, end=-1):
+        """Change of a numeric column between two loaded snapshots (labels or indexes) for every video in both."""
+        if self.snapshot_series is None:
+            print("Error: Snapshots not loaded")
+            return None
+        
+        series = self.snapshot_series
+        positions, start_values, end_values, delta, growth = series.deltas(column, start, end)
+        
+        return pd.DataFrame({
+            'video_id': series.video_ids[positions].astype(object),
+            'uploader': series.attribute('uploader', positions),
+            'category': series.attribute('category', positions),
+            f'{column}_start': start_values,
+            f'{column}_end': end_values,
+            'delta': delta,
+            'growth': growth
+        })
+    
+    def get_top_k_growth(self, k: int = 10, column: str = 'views', by: str = 'delta', start=0, end=-1,
+                         min_start: int = 1):
+        """Top k videos by absolute change ('delta') or relative growth ('growth') of column between two snapshots."""
+        if self.snapshot_series is None:
+            print("Error: Snapshots not loaded")
+            return None
+        
+        print(f"Finding top {k} videos by {column} {by} between snapshots...")
+        
+        series = self.snapshot_series
+        positions, start_values, end_values, delta, growth = series.deltas(column, start, end)
+        scores = delta if by == 'delta' else growth
+        
+        candidates = np.flatnonzero((start_values >= min_start) & ~np.isnan(scores))
+        if len(candidates) > k:
+            threshold = np.partition(scores[candidates], len(candidates) - k)[len(candidates) - k]
+            candidates = candidates[scores[candidates] >= threshold]
+        top = candidates[np.lexsort((candidates, -scores[candidates]))[:k]]
+        
+        return pd.DataFrame({
+            'video_id': series.video_ids[positions[top]].astype(object),
+            'uploader': series.attribute('uploader', positions[top]),
+            'category': series.attribute('category', positions[top]),
+            f'{column}_start': start_values[top],
+            f'{column}_end': end_values[top],
+            'delta': delta[top],
+            'growth': growth[top]
+        })
+    
+    @property
+    def top_k(self):
+        if self._top_k is None and self.video_df is not None:
+            self._top_k = TopKEngine(self.video_df)
+        return self._top_k
+    
+    @_cached_query
+    def find_videos_by_category_and_duration(self, category: str, min_duration: int, max_duration: int):
+        if self.video_df is None and not self.streaming:
+            print("Error: Video data not loaded")
+            return None
+        
+        print(f"Finding videos in category '{category}' with duration between {min_duration} and {max_duration} seconds...")
+        
+        result = self.query_range('length', min_duration, max_duration, category,
+                                  ['video_id', 'uploader', 'category', 'length', 'views', 'rate'])
+        
+        return result
+    
+    @property
+    def range_index(self):
+        if self._range_index is None and self.video_df is not None:
+            self._range_index = VideoRangeIndex(self.video_df)
+        return self._range_index
+    
+    @_cached_query
+    def query_range(self, column: str, min_value=None, max_value=None, category: str = None,
+                    columns: List[str] = None):
+        """Return videos with min_value <= column <= max_value, optionally within one category."""
+        if self.streaming:
+            if column == 'size' and self._sizes_for([]) is None:
+                return None
+            result = self._stream_select(column, min_value, max_value, category)
+            if result is None:
+                return None
+            return result[columns] if columns is not None else result
+        
+        if self.video_df is None:
+            print("Error: Video data not loaded")
+            return None
+        
+        if column not in self.range_index.sorted_columns:
+            print(f"Error: Column '{column}' is not indexed")
+            return None
+        
+        positions = self.range_index.positions(column, min_value, max_value, category)
+        result = self.video_df.iloc[positions]
+        
+        return result[columns] if columns is not None else result
+    
+    @_cached_query
+    def find_videos_by_size_range(self, min_size: int, max_size: int):
+        """Find all videos with size in range [x,y]."""
+        if self.video_df is None and not self.streaming:
+            print("Error: Video data not loaded")
+            return None
         
-        user_file_path = os.path.join(folder_path, "user.txt")
+        print(f"Finding videos with size between {min_size} and {max_size} bytes...")
         
-        if not os.path.exists(user_file_path):
-            print(f"User data file not found at {user_file_path}")
-            try:
-                for file in os.listdir(folder_path):
-                    if file.endswith('.txt') and ('user' in file.lower()) and ('id' not in file.lower()):
-                        user_file_path = os.path.join(folder_path, file)
-                        print(f"Using alternative user file: {user_file_path}")
-                        break
-                else:
-                    return None
-            except Exception as e:
-                print(f"Error searching for user files: {e}")
+        if not self.streaming and 'size' not in self.video_df.columns and not self._attach_size_column():
+            return None
+        
+        result = self.query_range('size', min_size, max_size,
+                                  columns=['video_id', 'uploader', 'category', 'size', 'views'])
+        if result is None:
+            return None
+        result = result.astype({'size': np.int64})
+        
+        result = result.sort_values(by=['size', 'views'], ascending=[False, False])
+        
+        return result
+    
+    def _sizes_for(self, video_ids):
+        """Look up sizes for video_ids (NaN where missing), loading size data on first use."""
+        if self.size_df is None:
+            size_path = os.path.join(self.data_directory, self.size_folder or "0523")
+            if not os.path.exists(size_path):
+                print(f"Error: Size folder {size_path} not found")
+                return None
+            
+            self.size_df = self._extract_size_data(size_path)
+            if self.size_df is None:
                 return None
         
+        if self._size_lookup is None:
+            sizes = self.size_df.drop_duplicates(subset='video_id')
+            self._size_lookup = (pd.Index(sizes['video_id']), sizes['size'].to_numpy(dtype=np.float64))
+        
+        size_index, size_values = self._size_lookup
+        positions = size_index.get_indexer(video_ids)
+        return np.where(positions >= 0, size_values[positions], np.nan)
+    
+    @_profiled()
+    def _attach_size_column(self):
+        """Align size data with video_df as a 'size' column (NaN where a video has no size record)."""
+        if 'size' in self._pending_loads:
+            self._load_pending('size')
+            if 'size' in self.video_df.columns:
+                return True
+        
+        sizes = self._sizes_for(self.video_df['video_id'])
+        if sizes is None:
+            return False
+        
+        self.video_df['size'] = sizes
+        self._range_index = None
+        self._data_version += 1
+        
+        print(f"Attached sizes to {int(np.count_nonzero(~np.isnan(sizes)))} of {len(self.video_df)} videos")
+        return True
+    
+    @_profiled()
+    def build_graph_store(self, store_path: str):
+        """Write the related-video graph as memory-mappable arrays that other analyzer processes can open."""
+        if self.related_targets is None or (self.video_df is None and self.node_uploaders is None):
+            print("Error: Video data not loaded")
+            return False
+        
+        print(f"Writing graph store to {store_path}...")
+        
+        _, uploader_names, node_uploaders = self._uploader_codes()
+        node_count = len(self.node_ids)
+        
+        sources = np.repeat(self.video_nodes, np.diff(self.related_offsets))
+        order = np.argsort(sources, kind='stable')
+        
+        offsets = np.zeros(node_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=node_count), out=offsets[1:])
+        
+        staging_path = store_path.rstrip(os.sep) + '.tmp'
         try:
-            user_data = []
+            shutil.rmtree(staging_path, ignore_errors=True)
+            os.makedirs(staging_path)
             
-            with open(user_file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                for line in f:
-                    line = line.strip()
-                    parts = line.split('\t')
-                    
-                    if len(parts) >= 3:
-                        username = parts[0]
-                        uploads = int(parts[1]) if parts[1].isdigit() else 0
-                        friends = parts[2]
-                        
-                        user_data.append({
-                            'username': username,
-                            'uploads': uploads,
-                            'friends': friends
-                        })
+            np.save(os.path.join(staging_path, 'node_ids.npy'),
+                    np.char.encode(np.asarray(self.node_ids, dtype=str), 'utf-8'))
+            np.save(os.path.join(staging_path, 'offsets.npy'), offsets)
+            np.save(os.path.join(staging_path, 'targets.npy'), np.asarray(self.related_targets, dtype=np.int32)[order])
+            np.save(os.path.join(staging_path, 'uploaders.npy'), node_uploaders.astype(np.int32))
+            with open(os.path.join(staging_path, 'uploader_names.txt'), 'w', encoding='utf-8') as f:
+                f.write('\n'.join(uploader_names))
             
-            if not user_data:
-                print(f"No data in {user_file_path}")
-                return None
+            manifest = {
+                'version': GRAPH_STORE_VERSION,
+                'nodes': node_count,
+                'edges': int(offsets[-1]),
+                'uploaders': len(uploader_names)
+            }
+            with open(os.path.join(staging_path, 'manifest.json'), 'w', encoding='utf-8') as f:
+                json.dump(manifest, f)
             
-            user_df = pd.DataFrame(user_data)
-            user_df['friends_list'] = user_df['friends'].apply(lambda x: x.split(',') if x else [])
-            print(f"Successfully loaded {len(user_df)} user records")
+            shutil.rmtree(store_path, ignore_errors=True)
+            os.replace(staging_path, store_path)
+        except Exception as e:
+            print(f"Error writing graph store {store_path}: {e}")
+            shutil.rmtree(staging_path, ignore_errors=True)
+            return False
+        
+        print(f"Graph store written: {node_count} videos, {int(offsets[-1])} edges")
+        return True
+    
+    @_profiled()
+    def open_graph_store(self, store_path: str):
+        """Memory-map a graph store written by build_graph_store as this analyzer's related-video graph."""
+        try:
+            with open(os.path.join(store_path, 'manifest.json'), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
             
-            return user_df
+            if manifest.get('version') != GRAPH_STORE_VERSION:
+                print(f"Error: Unsupported graph store version in {store_path}")
+                return False
             
+            node_ids = np.load(os.path.join(store_path, 'node_ids.npy'), mmap_mode='r')
+            offsets = np.load(os.path.join(store_path, 'offsets.npy'), mmap_mode='r')
+            targets = np.load(os.path.join(store_path, 'targets.npy'), mmap_mode='r')
+            uploaders = np.load(os.path.join(store_path, 'uploaders.npy'), mmap_mode='r')
+            with open(os.path.join(store_path, 'uploader_names.txt'), 'r', encoding='utf-8') as f:
+                uploader_names = f.read().split('\n') if manifest['uploaders'] else []
         except Exception as e:
-            print(f"Error reading user data: {e}")
-            return None
+            print(f"Error opening graph store {store_path}: {e}")
+            return False
+        
+        # The store replaces the crawl, so nothing derived from previously loaded video rows may survive.
+        self._pending_loads.pop('video', None)
+        self._reset_derived_state()
+        self.video_df = None
+        self._uploader_cube = None
+        self.ingested_files = {}
+        self._video_interner = None
+        self._node_has_row = None
+        self.streaming = False
+        self.stream_paths = None
+        self.stream_lengths = None
+        self.stream_skip_rows = None
+        if self._spill_cleanup is not None:
+            self._spill_cleanup()
+            self._spill_cleanup = None
+        self.node_ids = EncodedVideoIds(node_ids)
+        self.video_nodes = np.arange(manifest['nodes'], dtype=np.int32)
+        self.related_offsets = offsets
+        self.related_targets = targets
+        self.node_uploaders = uploaders
+        self.uploader_names = np.array(uploader_names, dtype=object)
+        
+        print(f"Opened graph store {store_path}: {manifest['nodes']} videos, {manifest['edges']} edges")
+        return True
     
-    def _extract_related_videos(self):
-        if self.video_df is None:
-            return None
+    def _uploader_codes(self):
+        """Return per-row uploader codes (-1 when missing), sorted uploader names and per-node codes."""
+        if self.node_uploaders is not None:
+            return self.node_uploaders, self.uploader_names, self.node_uploaders
         
-        print("Creating related videos mapping...")
+        uploaders = self.video_df['uploader']
+        valid = (uploaders.notna() & (uploaders != '')).to_numpy()
         
-        relationships = []
+        codes, names = pd.factorize(np.where(valid, uploaders.to_numpy(dtype=object), None), sort=True)
+        codes = codes.astype(np.int64)
         
-        for _, row in self.video_df.iterrows():
-            source_id = row['video_id']
-            related_ids = row['related_ids_list']
-            
-            for target_id in related_ids:
-                if target_id:
-                    relationships.append({
-                        'source_id': source_id,
-                        'target_id': target_id
-                    })
+        valid_rows = np.flatnonzero(valid)[::-1]
+        nodes, last = np.unique(self.video_nodes[valid_rows], return_index=True)
+        node_codes = np.full(len(self.node_ids), -1, dtype=np.int64)
+        node_codes[nodes] = codes[valid_rows[last]]
         
-        related_df = pd.DataFrame(relationships)
-        print(f"Created {len(related_df)} video relationship records")
+        return codes, np.asarray(names, dtype=object), node_codes
+    
+    @_cached_query
+    @_profiled()
+    def _uploader_pair_counts(self):
+        """Count related-video edges between every unordered pair of distinct uploaders, most linked first."""
+        row_codes, names, node_codes = self._uploader_codes()
         
-        return related_df
+        source_codes = np.repeat(row_codes, np.diff(self.related_offsets))
+        target_codes = node_codes[self.related_targets]
+        
+        linked = (source_codes >= 0) & (target_codes >= 0) & (source_codes != target_codes)
+        source_codes = source_codes[linked]
+        target_codes = target_codes[linked]
+        
+        pair_keys = np.minimum(source_codes, target_codes) * len(names) + np.maximum(source_codes, target_codes)
+        pair_keys, counts = np.unique(pair_keys, return_counts=True)
+        
+        order = np.argsort(-counts, kind='stable')
+        pair_keys = pair_keys[order]
+        
+        return pd.DataFrame({
+            'user1': names[pair_keys // len(names)],
+            'user2': names[pair_keys % len(names)],
+            'count': counts[order].astype(np.int64)
+        })
     
-    def get_top_k_categories(self, k: int = 10):
-        if self.video_df is None:
+    def _node_adjacency(self):
+        """Return a deduplicated, self-loop free node-level CSR (offsets, targets, sorted edge keys)."""
+        if self._node_graph is None:
+            with self.profiler.stage('_node_adjacency') as counts:
+                node_count = len(self.node_ids)
+                sources = np.repeat(self.video_nodes.astype(np.int64), np.diff(self.related_offsets))
+                targets = self.related_targets.astype(np.int64)
+                
+                edge_keys = np.sort((sources * node_count + targets)[sources != targets])
+                edge_keys = edge_keys[np.concatenate([[True], edge_keys[1:] != edge_keys[:-1]])]
+                targets = edge_keys % node_count
+                
+                offsets = np.zeros(node_count + 1, dtype=np.int64)
+                np.cumsum(np.bincount(edge_keys // node_count, minlength=node_count), out=offsets[1:])
+                
+                self._node_graph = (offsets, targets, edge_keys)
+                counts.update(nodes=node_count, edges=len(edge_keys))
+        
+        return self._node_graph
+    
+    @_profiled()
+    def _run_triangle_engine(self, list_triangles: bool, limit: int = None, seed: int = None, workers: int = 1):
+        offsets, targets, edge_keys = self._node_adjacency()
+        
+        sources = np.flatnonzero(np.diff(offsets))
+        if seed is not None:
+            sources = np.random.default_rng(seed).permutation(sources)
+        
+        blocks = [sources[i:i + TRIANGLE_BLOCK_SIZE] for i in range(0, len(sources), TRIANGLE_BLOCK_SIZE)]
+        
+        results = []
+        found = 0
+        
+        if workers > 1 and len(blocks) > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_triangle_worker,
+                                     initargs=(offsets, targets, edge_keys)) as pool:
+                wave_size = len(blocks) if limit is None else workers
+                for i in range(0, len(blocks), wave_size):
+                    wave = blocks[i:i + wave_size]
+                    for result in pool.map(_triangle_worker_block, wave, [list_triangles] * len(wave)):
+                        results.append(result)
+                        found += len(result) if list_triangles else result
+                    if limit is not None and found >= limit:
+                        break
+        else:
+            for block in blocks:
+                result = _triangle_block(block, offsets, targets, edge_keys, list_triangles)
+                results.append(result)
+                found += len(result) if list_triangles else result
+                if limit is not None and found >= limit:
+                    break
+        
+        self.profiler.count(nodes=len(offsets) - 1, edges=len(targets), found=found)
+        if not list_triangles:
+            return found
+        
+        triangles = np.concatenate(results) if results else np.zeros((0, 3), dtype=np.int64)
+        return triangles[:limit] if limit is not None else triangles
+    
+    @_cached_query
+    def count_triangles(self, workers: int = 1):
+        """Count every directed 3-cycle video1 -> video2 -> video3 -> video1 in the related-video graph."""
+        if self.related_targets is None:
             print("Error: Video data not loaded")
             return None
         
-        print(f"Finding top {k} categories with the most videos...")
-        
-        category_counts = self.video_df['category'].value_counts().reset_index()
-        category_counts.columns = ['category', 'count']
+        print("Counting triangles in video recommendations...")
         
-        top_categories = category_counts.head(k)
+        triangle_count = self._run_triangle_engine(False, workers=workers)
+        print(f"Found {triangle_count} triangles")
         
-        return top_categories
+        return triangle_count
     
-    def get_top_k_rated_videos(self, k: int = 10, min_ratings: int = 10):
-        if self.video_df is None:
+    def find_triangles(self, limit: int = None, seed: int = None, workers: int = 1):
+        """List directed 3-cycles, optionally stopping after limit; seed samples start videos reproducibly."""
+        if self.related_targets is None:
             print("Error: Video data not loaded")
             return None
         
-        print(f"Finding top {k} rated videos...")
+        triangles = self._run_triangle_engine(True, limit, seed, workers)
         
-        filtered_df = self.video_df[self.video_df['ratings'] >= min_ratings]
-        top_rated = filtered_df[['video_id', 'uploader', 'category', 'rate', 'ratings', 'views']]
-        top_rated = top_rated.sort_values(by=['rate', 'ratings'], ascending=False).head(k)
+        return pd.DataFrame({
+            'video1': self.node_ids[triangles[:, 0]],
+            'video2': self.node_ids[triangles[:, 1]],
+            'video3': self.node_ids[triangles[:, 2]]
+        })
+    
+    def _same_uploader_links(self):
+        """Rank uploaders by how many pairs of their videos are joined by a recommendation edge."""
+        if self._uploader_clusters is None:
+            _, names, node_codes = self._uploader_codes()
+            node_count = len(self.node_ids)
+            
+            sources = np.repeat(self.video_nodes.astype(np.int64), np.diff(self.related_offsets))
+            targets = np.asarray(self.related_targets, dtype=np.int64)
+            source_codes = node_codes[sources]
+            
+            same = (source_codes >= 0) & (source_codes == node_codes[targets]) & (sources != targets)
+            sources, targets = sources[same], targets[same]
+            pair_keys = np.unique(np.minimum(sources, targets) * node_count + np.maximum(sources, targets))
+            pair_uploaders = node_codes[pair_keys // node_count]
+            
+            videos = np.bincount(node_codes[node_codes >= 0], minlength=len(names))
+            linked = np.bincount(pair_uploaders, minlength=len(names))
+            
+            ranking = np.flatnonzero(videos > 1)
+            ranking = ranking[np.lexsort((ranking, -videos[ranking], -linked[ranking]))]
+            
+            rank_of = np.full(len(names), len(ranking), dtype=np.int64)
+            rank_of[ranking] = np.arange(len(ranking))
+            pair_order = np.lexsort((pair_keys, rank_of[pair_uploaders]))
+            
+            self._uploader_clusters = {
+                'names': names,
+                'ranking': ranking,
+                'videos': videos,
+                'linked': linked,
+                'pair_keys': pair_keys[pair_order],
+                'pair_ranks': rank_of[pair_uploaders][pair_order]
+            }
         
-        return top_rated
+        return self._uploader_clusters
     
-    def get_top_k_popular_videos(self, k: int = 10):
-        if self.video_df is None:
+    def get_uploader_clusters(self):
+        """Per-uploader count of video pairs linked by a recommendation edge, ranked by linked pairs."""
+        if self.related_targets is None:
             print("Error: Video data not loaded")
             return None
         
-        print(f"Finding top {k} most popular videos...")
+        clusters = self._same_uploader_links()
+        ranking = clusters['ranking']
         
-        top_popular = self.video_df[['video_id', 'uploader', 'category', 'views', 'rate', 'comments']]
-        top_popular = top_popular.sort_values(by='views', ascending=False).head(k)
+        videos = clusters['videos'][ranking]
+        linked = clusters['linked'][ranking]
+        possible = videos * (videos - 1) // 2
         
-        return top_popular
+        return pd.DataFrame({
+            'uploader': clusters['names'][ranking],
+            'videos': videos,
+            'linked_pairs': linked,
+            'possible_pairs': possible,
+            'density': linked / possible
+        })
     
-    def find_videos_by_category_and_duration(self, category: str, min_duration: int, max_duration: int):
-        if self.video_df is None:
+    def get_same_uploader_pairs(self, uploader: str = None, page: int = 1, page_size: int = 100):
+        """One page of same-uploader video pairs linked by a recommendation edge, in uploader rank order."""
+        if self.related_targets is None:
             print("Error: Video data not loaded")
             return None
         
-        print(f"Finding videos in category '{category}' with duration between {min_duration} and {max_duration} seconds...")
+        clusters = self._same_uploader_links()
+        pair_ranks = clusters['pair_ranks']
         
-        result = self.video_df[
-            (self.video_df['category'] == category) & 
-            (self.video_df['length'] >= min_duration) & 
-            (self.video_df['length'] <= max_duration)
-        ][['video_id', 'uploader', 'category', 'length', 'views', 'rate']]
+        start, end = 0, len(pair_ranks)
+        if uploader is not None:
+            code = np.flatnonzero(clusters['names'] == uploader)
+            rank = np.flatnonzero(clusters['ranking'] == code[0]) if len(code) else []
+            if len(rank) == 0:
+                return pd.DataFrame(columns=['video1', 'video2', 'uploader'])
+            start, end = np.searchsorted(pair_ranks, [rank[0], rank[0] + 1])
         
-        return result
+        start = min(start + (page - 1) * page_size, end)
+        end = min(start + page_size, end)
+        
+        node_count = len(self.node_ids)
+        pair_keys = clusters['pair_keys'][start:end]
+        
+        return pd.DataFrame({
+            'video1': self.node_ids[pair_keys // node_count],
+            'video2': self.node_ids[pair_keys % node_count],
+            'uploader': clusters['names'][clusters['ranking'][pair_ranks[start:end]]]
+        })
     
-    def find_videos_by_size_range(self, min_size: int, max_size: int):
-        """Find all videos with size in range [x,y]."""
-        if self.video_df is None:
+    @_profiled()
+    def compute_centrality(self, damping: float = PAGERANK_DAMPING, tolerance: float = CENTRALITY_TOLERANCE,
+                           max_iterations: int = CENTRALITY_MAX_ITERATIONS):
+        """Add PageRank, reach (distinct recommending videos) and HITS hub/authority columns to video_df."""
+        if self.video_df is None or self.related_targets is None:
             print("Error: Video data not loaded")
             return None
         
-        print(f"Finding videos with size between {min_size} and {max_size} bytes...")
+        print("Computing PageRank and HITS centrality over the related-video graph...")
         
-        size_file_path = os.path.join(self.data_directory, "0523", "size.txt")
+        offsets, targets, _ = self._node_adjacency()
+        node_count = len(self.node_ids)
         
-        try:
-            size_data = []
-            with open(size_file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                for line in f:
-                    parts = line.strip().split()
-                    if len(parts) >= 2:
-                        video_id = parts[0]
-                        size = int(parts[1]) if parts[1].isdigit() else 0
-                        size_data.append({'video_id': video_id, 'size': size})
-            
-            size_df = pd.DataFrame(size_data)
-            
-            video_with_size = pd.merge(self.video_df, size_df, on='video_id')
-            
-            result = video_with_size[
-                (video_with_size['size'] >= min_size) & 
-                (video_with_size['size'] <= max_size)
-            ][['video_id', 'uploader', 'category', 'size', 'views']]  
-            
-            result = result.sort_values(by=['size', 'views'], ascending=[False, False])
-            
-            return result
+        pagerank, pagerank_iterations = _pagerank(offsets, targets, damping, tolerance, max_iterations)
+        hub, authority, hits_iterations = _hits(offsets, targets, tolerance, max_iterations)
+        reach = np.bincount(targets, minlength=node_count)
         
-        except Exception as e:
-            print(f"Error reading size data: {e}")
+        self._centrality = {'pagerank': pagerank, 'reach': reach, 'hub': hub, 'authority': authority}
+        for column in CENTRALITY_COLUMNS:
+            self.video_df[column] = self._centrality[column][self.video_nodes]
+        self._data_version += 1
+        
+        self.profiler.count(nodes=node_count, edges=len(targets), pagerank_iterations=pagerank_iterations,
+                            hits_products=hits_iterations)
+        print(f"PageRank converged in {pagerank_iterations} iterations, HITS in {hits_iterations} "
+              f"({node_count} videos, {len(targets)} edges)")
+        return self.video_df[['video_id'] + CENTRALITY_COLUMNS]
+    
+    @_cached_query
+    def get_top_k_central_videos(self, k: int = 10, by: str = 'pagerank'):
+        """Top k videos by one of the centrality columns, computing them on first use."""
+        if by not in CENTRALITY_COLUMNS:
+            print(f"Error: Unknown centrality '{by}'")
+            return None
+        if self._centrality is None and self.compute_centrality() is None:
             return None
+        
+        print(f"Finding top {k} videos by {by}...")
+        
+        scores = self.video_df[by].to_numpy()
+        candidates = np.arange(len(scores))
+        if len(scores) > k:
+            threshold = np.partition(scores, len(scores) - k)[len(scores) - k]
+            candidates = np.flatnonzero(scores >= threshold)
+        top = candidates[np.lexsort((candidates, -scores[candidates]))[:k]]
+        
+        return self.video_df.iloc[top][['video_id', 'uploader', 'category', 'views'] + CENTRALITY_COLUMNS]
     
-    def find_recommendation_patterns(self, pattern_type: str, min_connections: int = 3):
+    @_profiled('find_recommendation_patterns:{pattern_type}')
+    def find_recommendation_patterns(self, pattern_type: str, min_connections: int = 3,
+                                     limit: int = 50, seed: int = None, workers: int = 1):
         print(f"Finding {pattern_type} recommendation patterns...")
         
+        import networkx as nx
+        
         G = nx.DiGraph()
-        pattern_data = []
         
         if pattern_type == "user_video_user":
-            if self.video_df is None:
+            if self.related_targets is None or (self.video_df is None and self.node_uploaders is None):
                 print("Error: Video data must be loaded for user_video_user pattern")
                 return None, None
             
             print("Looking for user connections through video relationships...")
             
-            video_to_uploader = {}
-            for _, row in self.video_df.iterrows():
-                if pd.notna(row['uploader']) and row['uploader'] != '':
-                    video_to_uploader[row['video_id']] = row['uploader']
+            pair_counts = self._uploader_pair_counts()
+            end = np.searchsorted(-pair_counts['count'].to_numpy(), -min_connections, side='right')
+            pattern_df = pair_counts.iloc[:end].reset_index(drop=True)
             
-            user_connections = defaultdict(int)
-            
-            processed_count = 0
-            total_videos = len(self.video_df)
-            
-            for _, row in self.video_df.iterrows():
-                processed_count += 1
-                if processed_count % 1000 == 0:
-                    print(f"Processed {processed_count}/{total_videos} videos...")
-                
-                source_video = row['video_id']
-                source_uploader = row['uploader']
-                
-                if pd.isna(source_uploader) or source_uploader == '':
-                    continue
-                    
-                related_videos = row['related_ids_list'] if 'related_ids_list' in row else []
-                if not related_videos and 'related_ids' in row:
-                    related_videos = row['related_ids'].split(',') if pd.notna(row['related_ids']) else []
-                
-                for related_video in related_videos:
-                    if related_video in video_to_uploader:
-                        related_uploader = video_to_uploader[related_video]
-                        if related_uploader == source_uploader:
-                            continue
-                        user_pair = tuple(sorted([source_uploader, related_uploader]))
-                        user_connections[user_pair] += 1
-            
-            strong_connections = {pair: count for pair, count in user_connections.items() 
-                                if count >= min_connections}
-            
-            print(f"Found {len(strong_connections)} user connections with at least {min_connections} shared videos")
-            
-            for (user1, user2), count in strong_connections.items():
-                pattern_data.append({
-                    'user1': user1,
-                    'user2': user2,
-                    'count': count
-                })
-                
-                G.add_edge(user1, user2, weight=count)
+            print(f"Found {len(pattern_df)} user connections with at least {min_connections} shared videos")
             
-            if pattern_data:
-                pattern_df = pd.DataFrame(pattern_data)
-                pattern_df = pattern_df.sort_values(by='count', ascending=False)
-            else:
-                pattern_df = pd.DataFrame(columns=['user1', 'user2', 'count'])
+            G.add_weighted_edges_from(zip(pattern_df['user1'], pattern_df['user2'], pattern_df['count']))
                 
         elif pattern_type == "video_user_video":
-            if self.video_df is None:
+            if self.related_targets is None or (self.video_df is None and self.node_uploaders is None):
                 print("Error: Video data must be loaded for video_user_video pattern")
                 return None, None
                 
             print("Finding videos uploaded by the same user...")
             
-            uploader_videos = defaultdict(list)
-            
-            valid_videos = self.video_df[self.video_df['uploader'].notna() & (self.video_df['uploader'] != '')]
-            
-            for _, row in valid_videos.iterrows():
-                uploader = row['uploader']
-                video_id = row['video_id']
-                uploader_videos[uploader].append(video_id)
-            
-            uploaders_with_multiple = sum(1 for uploader, videos in uploader_videos.items() if len(videos) > 1)
-            print(f"Found {uploaders_with_multiple} uploaders with multiple videos")
+            pattern_df = self.get_uploader_clusters()
+            print(f"Found {len(pattern_df)} uploaders with multiple videos")
             
-            count = 0
-            limit = 100  
+            pairs = self.get_same_uploader_pairs(page=1, page_size=limit)
+            for video1, video2, uploader in zip(pairs['video1'], pairs['video2'], pairs['uploader']):
+                G.add_edge(video1, video2, uploader=uploader)
             
-            for uploader, videos in uploader_videos.items():
-                if len(videos) > 1:
-                    pairs_for_this_uploader = 0
-                    
-                    for i in range(len(videos)):
-                        if pairs_for_this_uploader >= 5:
-                            break
-                            
-                        for j in range(i+1, min(i+6, len(videos))):
-                            video1 = videos[i]
-                            video2 = videos[j]
-                            
-                            pattern_data.append({
-                                'video1': video1,
-                                'video2': video2,
-                                'uploader': uploader
-                            })
-                            
-                            G.add_edge(video1, video2, uploader=uploader)
-                            
-                            pairs_for_this_uploader += 1
-                            count += 1
-                            
-                            if count >= limit:
-                                break
-                                
-                        if count >= limit:
-                            break
-                if count >= limit:
-                    break
-            
-            print(f"Created {count} video-user-video connections for visualization")
-            
-            if pattern_data:
-                pattern_df = pd.DataFrame(pattern_data)
-            else:
-                pattern_df = pd.DataFrame(columns=['video1', 'video2', 'uploader'])
+            print(f"Created {len(pairs)} video-user-video connections for visualization")
         
         elif pattern_type == "triangle":
-            if self.video_df is None:
+            if self.related_targets is None:
                 print("Error: Video data must be loaded for triangle pattern")
                 return None, None
                 
             print("Looking for triangle patterns in video recommendations...")
             
-            video_related = {}
-            for _, row in self.video_df.iterrows():
-                video_id = row['video_id']
-                
-                if 'related_ids_list' in row and isinstance(row['related_ids_list'], list):
-                    related_ids = row['related_ids_list']
-                elif 'related_ids' in row and pd.notna(row['related_ids']):
-                    related_ids = row['related_ids'].split(',')
-                else:
-                    related_ids = []
-                    
-                related_ids = [rid for rid in related_ids if rid]
-                
-                if related_ids:
-                    video_related[video_id] = related_ids
-            
-            print(f"Analyzing {len(video_related)} videos with related video information")
-            
-            triangle_count = 0
-            limit = 50 
-            
-            videos_with_relations = list(video_related.keys())
-            
-            import random
-            random.shuffle(videos_with_relations)
-            
-            processed_triangles = set()
-            
-            for video1 in videos_with_relations:
-                if triangle_count >= limit:
-                    break
-                    
-                for video2 in video_related.get(video1, []):
-                    if video2 not in video_related:
-                        continue
-                        
-                    for video3 in video_related.get(video2, []):
-                        if video3 not in video_related:
-                            continue
-                            
-                        if video1 in video_related.get(video3, []):
-                            triangle = tuple(sorted([video1, video2, video3]))
-                            
-                            if triangle not in processed_triangles:
-                                processed_triangles.add(triangle)
-                                pattern_data.append({
-                                    'video1': video1,
-                                    'video2': video2,
-                                    'video3': video3
-                                })
-                                
-                                G.add_edge(video1, video2)
-                                G.add_edge(video2, video3)
-                                G.add_edge(video3, video1)
-                                
-                                triangle_count += 1
-                                if triangle_count >= limit:
-                                    break
+            pattern_df = self.find_triangles(limit, seed, workers)
             
-            print(f"Found {triangle_count} triangle patterns")
+            print(f"Found {len(pattern_df)} triangle patterns")
             
-            if pattern_data:
-                pattern_df = pd.DataFrame(pattern_data)
-            else:
-                pattern_df = pd.DataFrame(columns=['video1', 'video2', 'video3'])
+            for video1, video2, video3 in zip(pattern_df['video1'], pattern_df['video2'], pattern_df['video3']):
+                G.add_edge(video1, video2)
+                G.add_edge(video2, video3)
+                G.add_edge(video3, video1)
             
         else:
             print(f"Error: Unknown pattern type '{pattern_type}'")
             return None, None
         
+        self.profiler.count(rows=len(pattern_df), nodes=G.number_of_nodes(), edges=G.number_of_edges())
         return G, pattern_df
     
-    def visualize_graph(self, G, title: str, filename: str = None):
-        if not G or len(G.nodes) == 0:
-            print("No graph data to visualize")
-            return
-            
-        plt.figure(figsize=(12, 8))
+    @property
+    def friend_graph(self):
+        """Undirected friendship graph over interned user IDs as (user_ids, CSR offsets, CSR targets)."""
+        if self._friend_graph is None and self.user_df is not None and 'friends' in self.user_df.columns:
+            self._friend_graph = self._build_friend_graph()
+        return self._friend_graph
+    
+    @_profiled()
+    def _build_friend_graph(self):
+        print("Creating friend network index...")
         
-        try:
+        usernames = self.user_df['username'].to_numpy(dtype=object)
+        friends = self.user_df['friends'].to_numpy(dtype=object)
+        
+        tokens = np.array(','.join(friends).split(','), dtype=object)
+        token_users = np.repeat(np.arange(len(friends)), self.user_df['friends'].str.count(',').to_numpy() + 1)
+        keep = tokens != ''
+        
+        codes, user_ids = pd.factorize(np.concatenate([usernames, tokens[keep]]))
+        user_count = len(user_ids)
+        
+        sources = codes[token_users[keep]]
+        targets = codes[len(usernames):]
+        
+        edge_keys = np.concatenate([sources * user_count + targets, targets * user_count + sources])
+        edge_keys = np.unique(edge_keys[np.concatenate([sources != targets, sources != targets])])
+        
+        offsets = np.zeros(user_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(edge_keys // user_count, minlength=user_count), out=offsets[1:])
+        
+        self.profiler.count(rows=user_count, edges=len(edge_keys) // 2)
+        print(f"Indexed {len(edge_keys) // 2} friendships between {user_count} users")
+        return np.asarray(user_ids, dtype=object), offsets, (edge_keys % user_count).astype(np.int32)
+    
+    def _friends_of(self, username: str):
+        user_ids, offsets, targets = self.friend_graph
+        code = pd.Index(user_ids).get_indexer([username])[0]
+        if code < 0:
+            return None
+        return targets[offsets[code]:offsets[code + 1]]
+    
+    def get_friend_components(self):
+        """Connected components of the friend network, largest first."""
+        if self.friend_graph is None:
+            print("Error: User data not loaded")
+            return None
+        
+        print("Finding connected components in the friend network...")
+        
+        user_ids, offsets, targets = self.friend_graph
+        sources = np.repeat(np.arange(len(user_ids)), np.diff(offsets))
+        labels = _connected_components(len(user_ids), sources, targets)
+        
+        roots, sizes = np.unique(labels, return_counts=True)
+        order = np.lexsort((roots, -sizes))
+        
+        components = pd.DataFrame({
+            'component': np.arange(1, len(roots) + 1),
+            'size': sizes[order],
+            'root_user': user_ids[roots[order]]
+        })
+        print(f"Found {len(components)} components, largest has {sizes.max() if len(sizes) else 0} users")
+        
+        return components
+    
+    def get_friend_degree_distribution(self):
+        """Number of users having each friend count."""
+        if self.friend_graph is None:
+            print("Error: User data not loaded")
+            return None
+        
+        _, offsets, _ = self.friend_graph
+        users_per_degree = np.bincount(np.diff(offsets))
+        degrees = np.flatnonzero(users_per_degree)
+        
+        return pd.DataFrame({'degree': degrees, 'users': users_per_degree[degrees]})
+    
+    def count_mutual_friends(self, user1: str, user2: str):
+        """Number of friends user1 and user2 have in common."""
+        if self.friend_graph is None:
+            print("Error: User data not loaded")
+            return None
+        
+        friends1 = self._friends_of(user1)
+        friends2 = self._friends_of(user2)
+        if friends1 is None or friends2 is None:
+            return 0
+        
+        return len(np.intersect1d(friends1, friends2, assume_unique=True))
+    
+    def get_top_k_connected_users(self, k: int = 10):
+        """Users with the most friends."""
+        if self.friend_graph is None:
+            print("Error: User data not loaded")
+            return None
+        
+        print(f"Finding top {k} most connected users...")
+        
+        user_ids, offsets, _ = self.friend_graph
+        degrees = np.diff(offsets)
+        
+        candidates = np.arange(len(degrees))
+        if len(degrees) > k:
+            kth = np.partition(degrees, len(degrees) - k)[len(degrees) - k]
+            candidates = np.flatnonzero(degrees >= kth)
+        candidates = candidates[np.lexsort((candidates, -degrees[candidates]))][:k]
+        
+        return pd.DataFrame({'username': user_ids[candidates], 'friends': degrees[candidates]})
+    
+    def _select_nodes(self, G, max_nodes: int, rank_by: str = 'weight'):
+        """Return the max_nodes nodes with the highest weighted (or plain) degree, all nodes if G is small enough."""
+        nodes = list(G.nodes())
+        if max_nodes is None or len(nodes) <= max_nodes:
+            return nodes
+        
+        index = {node: position for position, node in enumerate(nodes)}
+        edges = list(G.edges(data='weight', default=1))
+        sources = np.fromiter((index[u] for u, _, _ in edges), dtype=np.int64, count=len(edges))
+        targets = np.fromiter((index[v] for _, v, _ in edges), dtype=np.int64, count=len(edges))
+        weights = np.ones(len(edges)) if rank_by == 'degree' else np.fromiter(
+            (w for _, _, w in edges), dtype=np.float64, count=len(edges))
+        
+        scores = np.bincount(sources, weights, minlength=len(nodes)) + np.bincount(targets, weights, minlength=len(nodes))
+        return [nodes[position] for position in np.argsort(-scores, kind='stable')[:max_nodes]]
+    
+    @_profiled()
+    def _graph_layout(self, G, iterations: int = LAYOUT_ITERATIONS):
+        """Node positions for G, cached by a hash of its nodes and edges."""
+        import networkx as nx
+        
+        digest = hashlib.sha1(str(iterations).encode())
+        digest.update('\n'.join(sorted(map(repr, G.nodes()))).encode())
+        digest.update('\n'.join(sorted(map(repr, G.edges()))).encode())
+        key = digest.hexdigest()
+        
+        self.profiler.count(nodes=G.number_of_nodes(), edges=G.number_of_edges(), cached=key in self._layout_cache)
+        if key not in self._layout_cache:
             if len(G.nodes) < 30:
                 pos = nx.spring_layout(G, seed=42)
             elif len(G.nodes) < 100:
                 pos = nx.kamada_kawai_layout(G)
             else:
-                pos = nx.random_layout(G, seed=42)
-                
-            if len(G.nodes) > 100:
-                subset_nodes = list(G.nodes())[:100]
-                G_subset = G.subgraph(subset_nodes)
-                nx.draw(G_subset, pos, with_labels=True, node_color='lightblue', 
-                        node_size=500, edge_color='gray', arrows=True, 
-                        font_size=8, font_weight='bold')
-                plt.title(f"{title} (showing first 100 nodes of {len(G.nodes)} total)")
-            else:
-                nx.draw(G, pos, with_labels=True, node_color='lightblue', 
-                        node_size=500, edge_color='gray', arrows=True, 
-                        font_size=8, font_weight='bold')
-                plt.title(title)
+                nodes = list(G.nodes())
+                index = {node: position for position, node in enumerate(nodes)}
+                sources = np.fromiter((index[u] for u, _ in G.edges()), dtype=np.int64, count=G.number_of_edges())
+                targets = np.fromiter((index[v] for _, v in G.edges()), dtype=np.int64, count=G.number_of_edges())
+                pos = dict(zip(nodes, _force_layout(len(nodes), sources, targets, iterations)))
+            
+            if len(self._layout_cache) >= LAYOUT_CACHE_SIZE:
+                self._layout_cache.pop(next(iter(self._layout_cache)))
+            self._layout_cache[key] = pos
+        
+        return self._layout_cache[key]
+    
+    @_profiled('query:{name}')
+    def run_query(self, name: str, **params):
+        """Run one of BATCH_QUERIES by name and return its result as a DataFrame (None when there is none)."""
+        if name not in BATCH_QUERIES:
+            raise ValueError(f"Unknown query '{name}'")
+        
+        result = getattr(self, name)(**params)
+        if isinstance(result, tuple):
+            result = result[1]
+        if result is not None and not isinstance(result, pd.DataFrame):
+            result = pd.DataFrame({'value': [result]})
+        
+        return result
+    
+    @_profiled()
+    def visualize_graph(self, G, title: str, filename: str = None, max_nodes: int = 100,
+                        rank_by: str = 'weight', headless: bool = False, iterations: int = LAYOUT_ITERATIONS):
+        if not G or len(G.nodes) == 0:
+            print("No graph data to visualize")
+            return
+        
+        import networkx as nx
+        
+        if headless:
+            # A standalone Agg figure, so other threads' pyplot figures and the process-wide backend are untouched.
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            
+            plt = None
+            if not filename:
+                filename = f"{title.lower().replace(' ', '_')}.png"
+        else:
+            import matplotlib.pyplot as plt
+        
+        total_nodes = len(G.nodes)
+        nodes = self._select_nodes(G, max_nodes, rank_by)
+        if len(nodes) < total_nodes:
+            G = G.subgraph(nodes)
+            title = f"{title} (top {len(nodes)} of {total_nodes} nodes by {rank_by})"
+        
+        self.profiler.count(nodes=G.number_of_nodes(), edges=G.number_of_edges())
+        labelled = len(G.nodes) <= 100
+        if headless:
+            fig = Figure(figsize=(12, 8))
+            FigureCanvasAgg(fig)
+        else:
+            fig = plt.figure(figsize=(12, 8))
+        ax = fig.add_subplot()
+        
+        try:
+            pos = self._graph_layout(G, iterations)
+            nx.draw(G, pos, ax=ax, with_labels=labelled, node_color='lightblue',
+                    node_size=500 if labelled else 20, edge_color='gray',
+                    width=1.0 if labelled else 0.3, arrows=G.number_of_edges() <= 500,
+                    font_size=8, font_weight='bold')
+            ax.set_title(title)
             
             if filename:
-                plt.savefig(filename, dpi=300, bbox_inches='tight')
+                fig.savefig(filename, dpi=300 if labelled else 150, bbox_inches='tight')
                 print(f"Graph saved to {filename}")
             else:
                 plt.show()
@@ -567,12 +2750,18 @@ class YouTubeDataAnalyzer:
         except Exception as e:
             print(f"Error visualizing graph: {e}")
             try:
-                plt.figure(figsize=(10, 6))
-                nx.draw(G, with_labels=False, node_size=50, node_color='blue', edge_color='gray', arrows=False)
-                plt.title(f"{title} (simplified view)")
-                plt.show()
+                ax.clear()
+                nx.draw(G, ax=ax, with_labels=False, node_size=50, node_color='blue', edge_color='gray', arrows=False)
+                ax.set_title(f"{title} (simplified view)")
+                if filename:
+                    fig.savefig(filename, bbox_inches='tight')
+                else:
+                    plt.show()
             except Exception as e2:
                 print(f"Even simplified visualization failed: {e2}")
+        finally:
+            if plt is not None:
+                plt.close(fig)
     
     def display_results(self, df, title: str, limit: int = None):
         print(f"\n=== {title} ===")
@@ -584,16 +2773,14 @@ class YouTubeDataAnalyzer:
         if limit is None:
             limit = len(df)
         
-        display_df = df.copy().reset_index(drop=True)
+        display_df = df.head(limit).reset_index(drop=True)
         
         display_df.index = range(1, len(display_df) + 1)
         display_df.index.name = '#'
         
-        pd.set_option('display.max_columns', None)
-        pd.set_option('display.width', 1000)
-        pd.set_option('display.colheader_justify', 'center')
-        
-        print(display_df.head(limit).to_string())
+        with pd.option_context('display.max_columns', None, 'display.width', 1000,
+                               'display.colheader_justify', 'center'):
+            print(display_df.to_string())
         print(f"Total results: {len(df)}")
         
     def run_interactive_mode(self):
@@ -730,7 +2917,8 @@ if __name__ == "__main__":
     analyzer.load_data(
         video_folder="0222",   
         size_folder="0523",    
-        user_folder="0528"      
+        user_folder="0528",
+        lazy=True
     )
     
     analyzer.run_interactive_mode()
\ No newline at end of file